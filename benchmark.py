@@ -0,0 +1,533 @@
+"""Offline benchmark harness for the like bot.
+
+Runs the bot's hot paths against a local stand-in for the like API and fake
+Discord objects, so nothing touches the real API or the Discord gateway.
+
+    python benchmark.py                          # all scenarios, default sizes
+    python benchmark.py --scenarios like fetch_like --requests 2000 --concurrency 100
+    python benchmark.py --save-baseline bench_baseline.json
+    python benchmark.py --baseline bench_baseline.json   # compare against a saved run
+    python benchmark.py --scenarios usage_dict usage_compact --users 500000
+    python benchmark.py --scenarios render_legacy render --renders 50000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import discord
+import pytz
+from aiohttp import web
+
+import main
+
+SCENARIOS = (
+    "fetch_like", "like", "auto_like_task", "save_data", "load_data", "send_auto_like_report",
+    "usage_dict", "usage_compact", "render_legacy", "render",
+)
+
+# ==== STAND-IN LIKE API ====
+async def start_standin_api(latency, jitter, error_rate, maxlike_ratio):
+    """Serve a fake /like endpoint on a free local port; returns (runner, url template)"""
+    async def handle_like(request):
+        uid = request.query.get("uid", "0")
+        await asyncio.sleep(max(0.0, random.uniform(latency - jitter, latency + jitter)))
+        if random.random() < error_rate:
+            return web.Response(status=500, text="stand-in error")
+
+        likes = 0 if random.random() < maxlike_ratio else 100
+        before = random.randint(1000, 100000)
+        return web.json_response({
+            "status": 1 if likes else 2,
+            "PlayerNickname": f"Player{uid[-4:]}",
+            "UID": int(uid) if uid.isdigit() else uid,
+            "LikesGivenByAPI": likes,
+            "LikesbeforeCommand": before,
+            "LikesafterCommand": before + likes,
+        })
+
+    async def handle_root(request):
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/like", handle_like)
+    app.router.add_get("/", handle_root)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/like?uid={{uid}}&region={{region}}"
+
+# ==== FAKE DISCORD OBJECTS ====
+class FakeAvatar:
+    url = "https://example.invalid/avatar.png"
+
+class FakeRole:
+    def __init__(self, role_id):
+        self.id = role_id
+        self.name = f"role{role_id}"
+
+class FakeUser:
+    def __init__(self, user_id, roles=()):
+        self.id = user_id
+        self.roles = list(roles)
+        self.display_name = f"user{user_id}"
+        self.mention = f"<@{user_id}>"
+        self.display_avatar = FakeAvatar()
+
+class FakeMessage:
+    def __init__(self, channel, content=None, embed=None):
+        self.channel = channel
+        self.id = random.getrandbits(63)
+        self.content = content
+        self.embed = embed
+
+    async def edit(self, content=None, embed=None, **kwargs):
+        if content is not None:
+            self.content = content
+        if embed is not None:
+            self.embed = embed
+
+    async def delete(self):
+        self.channel.deleted += 1
+
+class FakeChannel:
+    def __init__(self, channel_id, latency=0.0):
+        self.id = channel_id
+        self.mention = f"<#{channel_id}>"
+        self.latency = latency
+        self.sent = 0
+        self.deleted = 0
+
+    async def send(self, content=None, embed=None, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.sent += 1
+        return FakeMessage(self, content, embed)
+
+class FakeGuild:
+    def __init__(self, guild_id, channels=()):
+        self.id = guild_id
+        self.channels = {channel.id: channel for channel in channels}
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+class FakeContext:
+    def __init__(self, author, guild, channel):
+        self.author = author
+        self.guild = guild
+        self.channel = channel
+
+    async def send(self, content=None, embed=None, **kwargs):
+        return await self.channel.send(content, embed=embed, **kwargs)
+
+# ==== HELPERS ====
+def make_uid(index):
+    return str(100000000 + index)
+
+async def run_concurrently(count, concurrency, operation):
+    """Run operation(i) for i in range(count) with at most `concurrency` in flight; returns latencies"""
+    latencies = []
+    queue = asyncio.Queue()
+    for index in range(count):
+        queue.put_nowait(index)
+
+    async def worker():
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            await operation(index)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, count))))
+    return latencies
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+# ==== SCENARIOS ====
+async def bench_fetch_like(args):
+    return await run_concurrently(
+        args.requests, args.concurrency, lambda i: main.fetch_like(make_uid(i % args.uid_pool), "IND")
+    )
+
+async def bench_like(args):
+    guild = FakeGuild(1, [FakeChannel(10)])
+    channel = guild.get_channel(10)
+
+    async def invoke(index):
+        ctx = FakeContext(FakeUser(1000 + index), guild, channel)
+        await main.like.callback(ctx, "IND", make_uid(index % args.uid_pool))
+
+    return await run_concurrently(args.requests, args.concurrency, invoke)
+
+async def bench_auto_like_task(args):
+    main.auto_like_uids.clear()
+    for index in range(args.uids):
+        main.auto_like_uids[make_uid(index)] = {"region": random.choice(["IND", "BD", "ID", "AUTO"]), "nickname": f"Player{index}"}
+    main.auto_like_scheduler.load(list(main.auto_like_uids))
+    # Every UID is due now, so one iteration runs them all; the sweep's own rate limits decide throughput
+    started = time.perf_counter()
+    await main.auto_like_task()
+    await asyncio.gather(*main.auto_like_batches)
+    return [time.perf_counter() - started]
+
+async def bench_save_data(args):
+    today = main.get_today_date()
+    for index in range(args.users):
+        await main.quota.charge(index)
+    for index in range(args.reports):
+        main.storage.add_report(today, {
+            "uid": make_uid(index), "nickname": f"Player{index}", "region": "IND",
+            "status": "success", "likes": 100, "timestamp": "12:00:00", "at": time.time(),
+        })
+    # First flush writes the whole data set, the rest are steady-state single-change flushes
+    latencies = []
+    for index in range(args.repeat):
+        await main.quota.charge(index)
+        started = time.perf_counter()
+        await main.flush_data()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+async def bench_load_data(args):
+    await main.flush_data()
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        main.load_data()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+async def bench_send_auto_like_report(args):
+    guilds = {}
+    main.report_channels.clear()
+    for index in range(args.channels):
+        channel = FakeChannel(50000 + index, latency=args.discord_latency)
+        guilds[20000 + index] = FakeGuild(20000 + index, [channel])
+        main.report_channels[str(20000 + index)] = channel.id
+    main.bot.get_guild = guilds.get
+
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        await main.send_auto_like_report()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+def usage_sample(users):
+    """(user_id, count) pairs shaped like real Discord snowflakes"""
+    rng = random.Random(users)
+    for _ in range(users):
+        yield rng.getrandbits(60), rng.randint(1, 5)
+
+async def bench_usage_dict(args):
+    """Load time and memory of usage/limits as the legacy per-user JSON dicts"""
+    today = main.get_today_date()
+    path = "usage_bench.json"
+    with open(path, "w") as f:
+        f.write('{"user_usage":{')
+        f.write(",".join(f'"{user_id}":{{"date":"{today}","count":{count}}}' for user_id, count in usage_sample(args.users)))
+        f.write('},"user_limits":{')
+        f.write(",".join(f'"{user_id}":{count}' for user_id, count in usage_sample(args.users // 10)))
+        f.write("}}")
+
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        with open(path) as f:
+            data = json.load(f)
+        latencies.append(time.perf_counter() - started)
+        del data
+    return latencies
+
+async def bench_usage_compact(args):
+    """Load time and memory of the same data in the compact usage store"""
+    store = main.UsageStore("usage_bench.bin")
+    store.day = datetime.now().toordinal()
+    for user_id, count in usage_sample(args.users):
+        store.usage[user_id] = count
+    for user_id, count in usage_sample(args.users // 10):
+        store.limits[user_id] = count
+    store.write_snapshot((store.day, *store.usage.snapshot(), *store.limits.snapshot()))
+    del store
+
+    latencies = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        store = main.UsageStore("usage_bench.bin")
+        store.load()
+        latencies.append(time.perf_counter() - started)
+        del store
+    return latencies
+
+# ==== RENDERING ====
+# Verbatim copies of the embed renderers from before the cached rendering layer, kept as
+# the "before" side of the render micro-benchmark
+def legacy_get_region_flag(region):
+    """Get flag emoji for region"""
+    flags = {
+        "BD": "🇧🇩", "IND": "🇮🇳", "ID": "🇮🇩", "TH": "🇹🇭", 
+        "VN": "🇻🇳", "SG": "🇸🇬", "MY": "🇲🇾", "PH": "🇵🇭",
+        "BR": "🇧🇷", "RU": "🇷🇺", "US": "🇺🇸", "PK": "🇵🇰",
+        "EG": "🇪🇬", "SA": "🇸🇦", "ME": "🇲🇪", "AUTO": "🌍"
+    }
+    return flags.get(region.upper(), "🌍")
+
+def legacy_make_success_embed(data, user, remaining_limit):
+    r = data["response"]
+    
+    # Get current time in Nepal timezone
+    tz = pytz.timezone("Asia/Kathmandu")
+    current_time = datetime.now(tz)
+    date_str = current_time.strftime("%Y-%m-%d")
+    time_str = current_time.strftime("%H:%M:%S")
+    
+    region_flag = legacy_get_region_flag(r.get('Region', 'AUTO'))
+    desc = f"""
+```
+✅ LIKES SENT SUCCESSFULLY!
+┌─ PLAYER: {r['PlayerNickname']} ({r['UID']})
+├─ REGION: {region_flag} {r.get('Region', 'AUTO')}
+├─ LIKES ADDED: +{r['LikesGivenByAPI']}
+├─ BEFORE: {r['LikesbeforeCommand']} → AFTER: {r['LikesafterCommand']}
+└─ YOUR REMAINING LIMIT: {remaining_limit}
+```
+🎮 [JOIN COMMUNITY](https://discord.gg/CmMG2xryMX)
+**DEVELOPER BY EM OFFICIAL TEAM** | {date_str} {time_str}
+    """
+    
+    embed = discord.Embed(description=desc, color=discord.Color.green())
+    embed.set_thumbnail(url=user.display_avatar.url)
+    embed.set_image(url="https://cdn.discordapp.com/attachments/1389124738395148391/1414487474788503662/static_1.png?ex=68bfbf9d&is=68be6e1d&hm=c3b04478724a952c020d61707c987e18aa4690b1ae05a129ef5f35f0b6d72af5&")
+    return embed
+
+def legacy_make_limit_embed(user, current_usage, daily_limit):
+    # Get current time in Nepal timezone
+    tz = pytz.timezone("Asia/Kathmandu")
+    current_time = datetime.now(tz)
+    date_str = current_time.strftime("%Y-%m-%d")
+    time_str = current_time.strftime("%H:%M:%S")
+    
+    desc = f"""
+**⚠️ Daily limit reached ({current_usage}/{daily_limit})**
+
+To get 5 requests/day:
+📺 [Subscribe](https://youtube.com/@emofficial1234?si=GgumInQC8DxjSHhK)
+📸 [Send Screenshot](https://discord.com/channels/1394679922068422738/1415038725775294657)
+
+🎮 [JOIN COMMUNITY](https://discord.gg/CmMG2xryMX)
+**DEVELOPER BY EM OFFICIAL TEAM** | {date_str} {time_str}
+    """
+    
+    embed = discord.Embed(description=desc, color=discord.Color.red())
+    embed.set_thumbnail(url=user.display_avatar.url)
+    return embed
+
+def legacy_make_maxlike_embed(user):
+    # Get current time in Nepal timezone
+    tz = pytz.timezone("Asia/Kathmandu")
+    current_time = datetime.now(tz)
+    date_str = current_time.strftime("%Y-%m-%d")
+    time_str = current_time.strftime("%H:%M:%S")
+    
+    desc = f"""
+```
+API LIMIT REACHED!
+┌─ STATUS: FAILED
+├─ REASON: UID has reached daily API limit
+├─ SOLUTION: Try with different UID
+└─ OR: Wait 24 hours for reset
+```
+💡 **Tip:** Use different UIDs or try again tomorrow
+
+🎮 [JOIN COMMUNITY](https://discord.gg/CmMG2xryMX)
+**DEVELOPER BY EM OFFICIAL TEAM** | {date_str} {time_str}
+    """
+    
+    embed = discord.Embed(description=desc, color=discord.Color.orange())
+    embed.set_thumbnail(url=user.display_avatar.url)
+    return embed
+
+def legacy_valid_region(region):
+    valid_regions = ["BD", "IND", "ID", "TH", "VN", "SG", "MY", "PH", "BR", "RU", "US", "PK", "EG", "SA", "ME", "AUTO"]
+    return region.upper() in valid_regions
+
+def current_valid_region(region):
+    return region.upper() in main.VALID_REGIONS
+
+def render_responses(args, valid_region, success, limit, maxlike):
+    """Per-response cost of what !like renders: region check, then a success, limit or maxlike embed"""
+    user = FakeUser(1000)
+    regions = list(main.REGION_FLAGS)
+    responses = [
+        {"status": "success", "response": {
+            "PlayerNickname": f"Player{index}", "UID": make_uid(index), "Region": regions[index % len(regions)],
+            "LikesGivenByAPI": 100, "LikesbeforeCommand": 1000 + index, "LikesafterCommand": 1100 + index,
+        }}
+        for index in range(64)
+    ]
+    latencies = []
+    for index in range(args.renders):
+        started = time.perf_counter()
+        valid_region(regions[index % len(regions)])
+        kind = index % 3
+        if kind == 0:
+            success(responses[index % len(responses)], user, 1)
+        elif kind == 1:
+            limit(user, 2, 2)
+        else:
+            maxlike(user)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+async def bench_render_legacy(args):
+    return render_responses(args, legacy_valid_region, legacy_make_success_embed, legacy_make_limit_embed,
+                            legacy_make_maxlike_embed)
+
+async def bench_render(args):
+    return render_responses(args, current_valid_region, main.make_success_embed, main.make_limit_embed,
+                            main.make_maxlike_embed)
+
+BENCHMARKS = {
+    "fetch_like": bench_fetch_like,
+    "like": bench_like,
+    "auto_like_task": bench_auto_like_task,
+    "save_data": bench_save_data,
+    "load_data": bench_load_data,
+    "send_auto_like_report": bench_send_auto_like_report,
+    "usage_dict": bench_usage_dict,
+    "usage_compact": bench_usage_compact,
+    "render_legacy": bench_render_legacy,
+    "render": bench_render,
+}
+
+# ==== RUNNER ====
+async def run_scenario(name, args):
+    if args.tracemalloc:
+        tracemalloc.reset_peak()
+    started = time.perf_counter()
+    latencies = await BENCHMARKS[name](args)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else 0
+    # auto_like_task is one call over many UIDs, so count UIDs for its throughput
+    operations = args.uids if name == "auto_like_task" else len(latencies)
+    return {
+        "operations": operations,
+        "seconds": round(elapsed, 4),
+        "throughput": round(operations / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0.0,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+def print_results(results, baseline=None):
+    header = f"{'scenario':<24}{'ops':>8}{'ops/s':>12}{'p50 ms':>12}{'p99 ms':>12}{'peak KB':>12}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        print(f"{name:<24}{result['operations']:>8}{result['throughput']:>12}"
+              f"{result['p50_ms']:>12}{result['p99_ms']:>12}{result['peak_kb']:>12}")
+        if baseline and name in baseline:
+            print(f"{'  vs baseline':<24}{'':>8}"
+                  + "".join(f"{format_change(result[key], baseline[name].get(key)):>12}"
+                            for key in ("throughput", "p50_ms", "p99_ms", "peak_kb")))
+
+def format_change(current, previous):
+    if not previous:
+        return "n/a"
+    return f"{(current - previous) / previous * 100:+.1f}%"
+
+async def run(args):
+    runner, api_url = await start_standin_api(args.api_latency, args.api_jitter, args.error_rate, args.maxlike_ratio)
+    main.api_pool = main.ApiEndpointPool([api_url])
+    await main.api_client.start()
+
+    # Upstream quotas and sweep rate limits are not what is being measured
+    main.DEFAULT_DAILY_LIMIT = 10 ** 9
+    main.AUTO_LIKE_GLOBAL_RATE = main.AUTO_LIKE_REGION_RATE = args.sweep_rate
+    main.AUTO_LIKE_GLOBAL_BURST = main.AUTO_LIKE_REGION_BURST = max(1, int(args.sweep_rate))
+    main.AUTO_LIKE_CONCURRENCY = args.concurrency
+    main.load_data()
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    results = {}
+    try:
+        for name in args.scenarios:
+            results[name] = await run_scenario(name, args)
+    finally:
+        if args.tracemalloc:
+            tracemalloc.stop()
+        await main.api_client.close()
+        await runner.cleanup()
+        if main.storage is not None:
+            main.storage.close()
+            main.storage = None
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline benchmark for the like bot")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="fetch_like / like calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--uid-pool", type=int, default=10 ** 6, help="distinct UIDs cycled through by fetch_like/like")
+    parser.add_argument("--uids", type=int, default=500, help="auto-like UIDs swept by auto_like_task")
+    parser.add_argument("--users", type=int, default=50000, help="users with usage today (save/load and usage_* scenarios)")
+    parser.add_argument("--reports", type=int, default=20000, help="report rows for today")
+    parser.add_argument("--channels", type=int, default=50, help="report channels for send_auto_like_report")
+    parser.add_argument("--renders", type=int, default=30000, help="responses rendered by render/render_legacy")
+    parser.add_argument("--repeat", type=int, default=20, help="iterations of save/load/report scenarios")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="stand-in API latency in seconds")
+    parser.add_argument("--api-jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--maxlike-ratio", type=float, default=0.3)
+    parser.add_argument("--discord-latency", type=float, default=0.02, help="fake channel.send latency in seconds")
+    parser.add_argument("--sweep-rate", type=float, default=1000.0, help="sweep rate limit (requests/second)")
+    parser.add_argument("--storage", choices=("sqlite", "json"), default=main.STORAGE_BACKEND)
+    parser.add_argument("--no-tracemalloc", dest="tracemalloc", action="store_false", help="skip peak memory tracking")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write results to PATH")
+    parser.add_argument("--baseline", metavar="PATH", help="compare results against PATH")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    main.STORAGE_BACKEND = args.storage
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    baseline_path = os.path.abspath(args.save_baseline) if args.save_baseline else None
+
+    # Keep data.json/data.db of a real deployment out of reach
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            results = asyncio.run(run(args))
+        finally:
+            os.chdir(cwd)
+
+    print_results(results, baseline)
+    if baseline_path:
+        with open(baseline_path, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=4)
+        print(f"Saved baseline to {baseline_path}")
+    main.log_listener.stop()
@@ -1,34 +1,425 @@
 import os
 import aiohttp
 import asyncio
+import cProfile
+import csv
+import hashlib
+import heapq
+import io
 import json
+import logging
+import logging.handlers
+import pstats
+import queue
+import random
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import traceback
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque, namedtuple
+from collections.abc import MutableMapping
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 import pytz
+from aiohttp import web
+
+process_started = time.monotonic()
 
 # ==== BOT TOKEN AND API CONFIG ====
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 API_BASE = "https://jamilikeapi.vercel.app/like?uid={uid}&region={region}"
+# Extra compatible deployments, comma separated URL templates in the same format as API_BASE
+API_ENDPOINTS = [API_BASE] + [url.strip() for url in os.getenv("API_ENDPOINTS", "").split(",") if url.strip() and url.strip() != API_BASE]
+
+# Endpoint pool: latency-aware routing and background health probes
+ENDPOINT_EWMA_ALPHA = 0.2       # weight of the newest sample in latency/error averages
+ENDPOINT_DEFAULT_LATENCY = 1.0  # seconds assumed for an endpoint with no samples yet
+ENDPOINT_PROBE_INTERVAL = 30    # seconds between health probes
+ENDPOINT_PROBE_TIMEOUT = 5
+ENDPOINT_UNHEALTHY_AFTER = 2    # consecutive failed probes before leaving rotation
+
+# HTTP client tuning for the like API
+HTTP_TIMEOUT = 30               # total seconds per request
+HTTP_CONNECT_TIMEOUT = 10
+HTTP_CONNECTION_LIMIT = 100     # pooled connections across all hosts
+HTTP_CONNECTION_LIMIT_PER_HOST = 50
+HTTP_KEEPALIVE_TIMEOUT = 60     # seconds an idle connection is kept for reuse
+HTTP_DNS_CACHE_TTL = 300
+
+# Circuit breaker and retry policy for the like API
+BREAKER_WINDOW = 20             # recent calls used to compute the failure rate
+BREAKER_MIN_CALLS = 5           # calls needed in the window before the breaker can trip
+BREAKER_FAILURE_RATE = 0.5
+BREAKER_SLOW_CALL = 10.0        # seconds; slower calls count as failures
+BREAKER_OPEN_SECONDS = 30       # how long to fail fast before letting a probe through
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5          # seconds, doubled per attempt with full jitter
+RETRY_MAX_DELAY = 4.0
+RETRY_BUDGET = 40.0             # seconds from the first attempt until the last one has to finish
+
+# Upstream daily like reset, used to expire cached maxlike results
+API_RESET_TIMEZONE = "Asia/Kathmandu"
+API_RESET_HOUR = 0
+MAXLIKE_CACHE_SIZE = 10000  # (uid, region) pairs remembered as exhausted until the reset
+
+# Sharding: by default one process runs every shard. A cluster is CLUSTER_COUNT processes on one host,
+# all started with the same SHARD_COUNT and CLUSTER_ID 0..CLUSTER_COUNT-1, sharing state through DB_FILE
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0")) or None  # None lets Discord recommend a count
+CLUSTER_COUNT = int(os.getenv("CLUSTER_COUNT", "1"))
+CLUSTER_ID = int(os.getenv("CLUSTER_ID", "0"))
+CLUSTERED = CLUSTER_COUNT > 1
+SHARD_IDS = list(range(CLUSTER_ID, SHARD_COUNT, CLUSTER_COUNT)) if CLUSTERED and SHARD_COUNT else None
+QUOTA_BUSY_TIMEOUT = 0.5  # seconds a shared quota query waits on another process's write lock
+QUOTA_STARTUP_TIMEOUT = 30  # the same while creating and importing the shared quota tables
+QUOTA_RELEASE_ATTEMPTS = 10  # tries to hand back reserved units before the refund is given up
+
+# Local Prometheus-style metrics endpoint (http://METRICS_HOST:METRICS_PORT/metrics), 0 disables it
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+if METRICS_PORT:
+    METRICS_PORT += CLUSTER_ID  # one port per cluster process
+
+# Event loop watchdog: a stall longer than the threshold logs the stack the loop is stuck in
+LOOP_LAG_INTERVAL = 0.5         # seconds between loop heartbeats
+LOOP_LAG_THRESHOLD = 0.25       # seconds of lag counted as a stall
+LOOP_STALL_SAMPLES = 10         # recent stall stacks kept for /profile reports
+PROFILE_MAX_SECONDS = 120
+PROFILE_TOP = 40                # functions listed per section of a /profile report
+
+# Logging: DEBUG also dumps full API payloads
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Startup: the global slash command sync only runs when the command tree changed
+COMMAND_HASH_FILE = "commands.sha256"
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "") == "1"
 
 # Owner IDs
 OWNER_IDS = [1380183114109947924]
 
-# Data file for persistent storage
-DATA_FILE = "data.json"
+# Persistent storage: "sqlite" (default) or "json" (legacy single-file backend); clusters always share SQLite
+STORAGE_BACKEND = "sqlite" if CLUSTERED else os.getenv("STORAGE_BACKEND", "sqlite")
+DB_FILE = "data.db"
+DATA_FILE = "data.json"  # JSON backend file, migrated into DB_FILE on first SQLite start
+USAGE_FILE = "usage.bin"  # compact binary store for daily usage counters and per-user limits
+SAVE_INTERVAL = 5  # seconds between write-behind flushes
+
+# Auto-like report retention: raw rows are kept this many days, then compacted into daily rollups
+REPORT_RETENTION_DAYS = 7
+ROLLUP_RETENTION_DAYS = 365
 
 # Default daily limit for regular members
 DEFAULT_DAILY_LIMIT = 2
 
+# !like request scheduler
+LIKE_WORKERS = 16               # fetch_like calls the !like queue runs at once
+LIKE_QUEUE_HIGH_WATER = 500     # queued requests beyond which new ones are turned away
+LIKE_QUEUE_RETRY_AFTER = 30     # seconds suggested to users turned away by a full queue
+LIKE_BATCH_MAX = 5              # UIDs in one !like
+LIMIT_MESSAGE_TTL = 20          # seconds before a "limit reached" reply is deleted
+DELETE_BATCH_MAX = 100          # Discord's bulk delete maximum
+
+# Auto-like sweep tuning
+AUTO_LIKE_CONCURRENCY = 20      # max fetch_like calls in flight during a sweep
+AUTO_LIKE_GLOBAL_RATE = 10.0    # requests/second across all regions
+AUTO_LIKE_GLOBAL_BURST = 20
+AUTO_LIKE_REGION_RATE = 4.0     # requests/second per region (default)
+AUTO_LIKE_REGION_BURST = 8
+AUTO_LIKE_REGION_RATES = {}     # region: (rate, burst) overrides, e.g. {"IND": (6.0, 12)}
+
+# Auto-like scheduling: each UID is retried when it is next due, not on a fixed sweep
+AUTO_LIKE_RESET_SPREAD = 300    # seconds of random delay after the daily reset, spreads the post-reset burst
+AUTO_LIKE_RETRY_BASE = 300      # seconds before retrying a UID after an error, doubled per failure
+AUTO_LIKE_RETRY_MAX = 3600
+AUTO_LIKE_REPORT_INTERVAL = 3600  # min seconds between auto-like reports
+AUTO_LIKE_REPORT_CHECK = 60     # seconds between checks for results the last report missed
+
+# Auto-like report delivery
+REPORT_PAGE_CHARS = 4000        # embed description limit is 4096, keep headroom for the page header
+REPORT_MAX_PAGES = 5            # bigger reports are sent as a summary embed plus a text file
+REPORT_SEND_CONCURRENCY = 5     # report channels delivered to in parallel
+REPORT_SEND_TIMEOUT = 60        # seconds one channel may take before it is skipped
+
+# Bulk auto-like import
+IMPORT_MAX_BYTES = 2 * 1024 * 1024
+IMPORT_MAX_ERRORS_SHOWN = 15
+
+# /listauto pages
+LISTAUTO_PAGE_SIZE = 20
+LISTAUTO_VIEW_TIMEOUT = 300     # seconds the page buttons stay active
+
+# ==== LOGGING ====
+class StructuredLogger(logging.LoggerAdapter):
+    """Logger adapter that turns extra keyword arguments into key=value fields"""
+    RESERVED = {"exc_info", "stack_info", "stacklevel", "extra"}
+
+    def process(self, msg, kwargs):
+        fields = {key: kwargs.pop(key) for key in list(kwargs) if key not in self.RESERVED}
+        kwargs.setdefault("extra", {})["fields"] = fields
+        return msg, kwargs
+
+class KeyValueFormatter(logging.Formatter):
+    """Appends a record's structured fields to the message as key=value pairs"""
+    def formatMessage(self, record):
+        message = super().formatMessage(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            message += " | " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return message
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves all formatting to the listener thread"""
+    def prepare(self, record):
+        return record
+
+def setup_logging():
+    """Route all logging through a queue so formatting and writes happen off the event loop"""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(KeyValueFormatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    
+    root = logging.getLogger()
+    root.handlers[:] = [DeferredQueueHandler(log_queue)]
+    root.setLevel(LOG_LEVEL)
+    listener.start()
+    return listener
+
+log_listener = setup_logging()
+log = StructuredLogger(logging.getLogger("likebot"), {})
+
+# ==== METRICS ====
+class Metric:
+    """Base for labelled metrics rendered in Prometheus text format"""
+    kind = "untyped"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.values = {}  # sorted label items tuple: value
+        METRICS.append(self)
+
+    @staticmethod
+    def label_key(labels):
+        return tuple(sorted(labels.items()))
+
+    @staticmethod
+    def format_labels(key, extra=()):
+        items = list(key) + list(extra)
+        if not items:
+            return ""
+        return "{" + ",".join(f'{name}="{value}"' for name, value in items) + "}"
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.render_samples())
+        return lines
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self.label_key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels):
+        return self.values.get(self.label_key(labels), 0)
+
+    def total(self, **labels):
+        """Sum over every series matching the given labels"""
+        wanted = set(labels.items())
+        return sum(value for key, value in self.values.items() if wanted <= set(key))
+
+    def render_samples(self):
+        return [f"{self.name}{self.format_labels(key)} {value}" for key, value in self.values.items()]
+
+class Histogram(Metric):
+    kind = "histogram"
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def observe(self, value, **labels):
+        key = self.label_key(labels)
+        state = self.values.get(key)
+        if state is None:
+            # bucket counts (last one is +Inf), sum, count
+            state = self.values[key] = [[0] * (len(self.BUCKETS) + 1), 0.0, 0]
+        counts = state[0]
+        for index, bound in enumerate(self.BUCKETS):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+        state[1] += value
+        state[2] += 1
+
+    def merged(self, labels):
+        """Bucket counts, sum and count over every series matching the given labels"""
+        wanted = set(labels.items())
+        counts = [0] * (len(self.BUCKETS) + 1)
+        total = 0.0
+        count = 0
+        for key, (series_counts, series_sum, series_count) in self.values.items():
+            if wanted <= set(key):
+                counts = [a + b for a, b in zip(counts, series_counts)]
+                total += series_sum
+                count += series_count
+        return counts, total, count
+
+    def count(self, **labels):
+        return self.merged(labels)[2]
+
+    def quantile(self, q, **labels):
+        """Approximate quantile (upper bound of the matching bucket), None without samples"""
+        counts, _, count = self.merged(labels)
+        if not count:
+            return None
+        running = 0
+        for bound, bucket_count in zip(self.BUCKETS, counts):
+            running += bucket_count
+            if running >= q * count:
+                return bound
+        return float("inf")
+
+    def render_samples(self):
+        lines = []
+        for key, (counts, total, count) in self.values.items():
+            running = 0
+            for bound, bucket_count in zip(self.BUCKETS, counts):
+                running += bucket_count
+                lines.append(f"{self.name}_bucket{self.format_labels(key, [('le', bound)])} {running}")
+            lines.append(f"{self.name}_bucket{self.format_labels(key, [('le', '+Inf')])} {count}")
+            lines.append(f"{self.name}_sum{self.format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{self.format_labels(key)} {count}")
+        return lines
+
+METRICS = []
+
+fetch_like_seconds = Histogram("likebot_fetch_like_seconds", "fetch_like latency by outcome (success, maxlike, cached, error)")
+api_attempts_total = Counter("likebot_api_attempts_total", "Upstream like API attempts by endpoint and outcome")
+like_command_seconds = Histogram("likebot_like_command_seconds", "!like end-to-end time until the reply, by outcome")
+quota_rejections_total = Counter("likebot_quota_rejections_total", "!like requests rejected by the daily limit")
+sweep_seconds = Histogram("likebot_auto_like_sweep_seconds", "Auto-like sweep duration")
+sweep_uids_total = Counter("likebot_auto_like_uids_total", "UIDs processed by auto-like sweeps, by status")
+storage_flush_seconds = Histogram("likebot_storage_flush_seconds", "Time to write pending state to disk, by backend")
+like_queue_wait_seconds = Histogram("likebot_like_queue_wait_seconds", "Time !like requests wait in the scheduler queue")
+like_queue_rejections_total = Counter("likebot_like_queue_rejections_total", "!like requests turned away by a full queue")
+report_seconds = Histogram("likebot_auto_like_report_seconds", "Time to build and deliver the auto-like report")
+report_deliveries_total = Counter("likebot_report_deliveries_total", "Auto-like report deliveries by outcome")
+startup_seconds = Histogram("likebot_startup_seconds", "Seconds from process start to each startup phase")
+loop_lag_seconds = Histogram("likebot_loop_lag_seconds", "How late the event loop heartbeat ran")
+loop_stalls_total = Counter("likebot_loop_stalls_total", "Event loop stalls longer than LOOP_LAG_THRESHOLD")
+quota_busy_total = Counter("likebot_quota_busy_total", "Shared quota operations given up on a locked database, by operation")
+
+def render_metrics():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+async def handle_metrics(request):
+    return web.Response(text=render_metrics(), content_type="text/plain", charset="utf-8")
+
+async def start_metrics_server():
+    """Serve /metrics on METRICS_HOST:METRICS_PORT; returns the runner to clean up on shutdown"""
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, METRICS_HOST, METRICS_PORT).start()
+    log.info("📈 Metrics endpoint listening", url=f"http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+    return runner
+
+# ==== DIAGNOSTICS ====
+class LoopWatchdog:
+    """Measures event loop lag and samples the stack of whatever is blocking it.
+    
+    A heartbeat task records how late each tick runs. A watcher thread notices
+    when the heartbeat stops while the loop is blocked, and grabs the loop
+    thread's current frame, the code responsible, before the stall ends.
+    """
+    def __init__(self, interval, threshold):
+        self.interval = interval
+        self.threshold = threshold
+        self.heartbeat = time.monotonic()
+        self.loop_thread = None
+        self.task = None
+        self.thread = None
+        self.stopping = threading.Event()
+        self.stalls = deque(maxlen=LOOP_STALL_SAMPLES)  # (time, seconds blocked, stack)
+
+    def start(self):
+        if self.task is not None:
+            return
+        self.loop_thread = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self.stopping.clear()
+        self.task = asyncio.create_task(self.beat())
+        self.thread = threading.Thread(target=self.watch, name="loop-watchdog", daemon=True)
+        self.thread.start()
+
+    async def stop(self):
+        self.stopping.set()
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def beat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self.heartbeat = now
+            loop_lag_seconds.observe(lag)
+            if lag > self.threshold:
+                # The watcher thread already logged this stall, with its stack
+                loop_stalls_total.inc()
+
+    def watch(self):
+        sampled = None  # heartbeat of the stall already sampled
+        while not self.stopping.wait(self.threshold / 2):
+            heartbeat = self.heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked <= self.threshold or sampled == heartbeat:
+                continue
+            frame = sys._current_frames().get(self.loop_thread)
+            if frame is None:
+                continue
+            sampled = heartbeat
+            stack = "".join(traceback.format_stack(frame))
+            self.stalls.append((datetime.now().strftime("%H:%M:%S"), blocked, stack))
+            log.warning("🐢 Event loop blocked", seconds=round(blocked, 3), stack="\n" + stack)
+
+loop_watchdog = LoopWatchdog(LOOP_LAG_INTERVAL, LOOP_LAG_THRESHOLD)
+
 # ==== GLOBAL STORAGE ====
-user_limits = {}  # user_id: daily_limit
+user_limits = {}  # user_id: daily_limit (legacy, imported into usage_store on first start)
 role_limits = {}  # role_id: daily_limit
-user_usage = {}   # user_id: {"date": "2024-01-01", "count": 0}
+user_usage = {}   # user_id: {"date": "2024-01-01", "count": 0} (legacy, imported into usage_store on first start)
 like_channels = {}  # guild_id: channel_id
 auto_like_uids = {}  # uid: {"region": "AUTO", "nickname": "Unknown"}
 report_channels = {}  # guild_id: channel_id
-auto_like_reports = {}  # date: [{"uid": "123", "status": "success", "likes": 5}]
+# Auto-like reports (date: [{"uid": "123", "status": "success", "likes": 5}]) live in the storage backend
+
+# ==== CLUSTER ====
+def owns_uid(uid):
+    """Each auto-like UID is swept by exactly one cluster process"""
+    return not CLUSTERED or int(uid) % CLUSTER_COUNT == CLUSTER_ID
+
+def is_local_guild(guild_id):
+    """Whether the guild is on one of this process's shards"""
+    if not CLUSTERED:
+        return True
+    return (int(guild_id) >> 22) % SHARD_COUNT in SHARD_IDS
 
 # ==== INTENTS ====
 intents = discord.Intents.default()
@@ -36,91 +427,1299 @@ intents.message_content = True
 intents.guilds = True
 intents.members = True
 
-class LikeBot(commands.Bot):
+class LikeBot(commands.AutoShardedBot):
     def __init__(self):
-        super().__init__(command_prefix="!", intents=intents)
+        super().__init__(command_prefix="!", intents=intents, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS)
+        self.metrics_runner = None
 
     async def setup_hook(self):
-        # Sync slash commands
+        # State is loaded once per process; on_ready fires again on every reconnect
+        load_data()
+        
+        # Open the pooled API client before anything can call fetch_like
+        await api_client.start()
+        
+        # Commands are global, one cluster process is enough to sync them
+        if CLUSTER_ID == 0:
+            await self.sync_commands()
+        
+        # Background health probes for the API endpoint pool; the first one doubles as API warmup
+        if not endpoint_health_task.is_running():
+            endpoint_health_task.start()
+        
+        # Local metrics endpoint
+        if METRICS_PORT and self.metrics_runner is None:
+            try:
+                self.metrics_runner = await start_metrics_server()
+            except OSError as e:
+                log.error("Could not start metrics endpoint", port=METRICS_PORT, error=e)
+        
+        # Start write-behind persistence
+        if not persist_task.is_running():
+            persist_task.start()
+        
+        # Start auto-like task (it waits for the gateway to be ready)
+        if not auto_like_task.is_running():
+            await init_auto_like_schedule()
+            auto_like_task.start()
+            log.info("🤖 Auto-like task started")
+        if not auto_like_report_task.is_running():
+            auto_like_report_task.start()
+        
+        loop_watchdog.start()
+        
+        mark_startup("setup_hook")
+
+    async def sync_commands(self):
+        """Sync slash commands globally, unless the tree is identical to the one synced last time"""
+        payload = [command.to_dict() for command in self.tree.get_commands()]
+        digest = hashlib.sha256(json.dumps([self.application_id, payload], sort_keys=True).encode()).hexdigest()
+        try:
+            with open(COMMAND_HASH_FILE, "r") as f:
+                synced = f.read().strip()
+        except OSError:
+            synced = None
+        
+        if synced == digest and not FORCE_COMMAND_SYNC:
+            log.info("✅ Slash commands unchanged, sync skipped", commands=len(payload))
+            return
+        
         await self.tree.sync()
-        print("✅ Slash commands synced!")
+        tmp_file = COMMAND_HASH_FILE + ".tmp"
+        with open(tmp_file, "w") as f:
+            f.write(digest)
+        os.replace(tmp_file, COMMAND_HASH_FILE)
+        log.info("✅ Slash commands synced", commands=len(payload))
+
+    async def close(self):
+        # Stop the write-behind loop and make sure the last mutations hit the disk
+        if persist_task.is_running():
+            persist_task.stop()
+        if endpoint_health_task.is_running():
+            endpoint_health_task.cancel()
+        await flush_data()
+        await like_scheduler.stop()
+        await message_reaper.stop()
+        await loop_watchdog.stop()
+        await api_client.close()
+        if self.metrics_runner is not None:
+            await self.metrics_runner.cleanup()
+            self.metrics_runner = None
+        await super().close()
 
 bot = LikeBot()
 
-# ==== SESSION ====
-session: aiohttp.ClientSession | None = None
+# ==== API CLIENT ====
+class LikeApiClient:
+    """Pooled HTTP client for the like API, started in setup_hook and closed with the bot"""
+    def __init__(self):
+        # One timeout object shared by every request instead of one per call
+        self.timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+        self.session: aiohttp.ClientSession | None = None
 
-# ==== LOAD/SAVE DATA ====
-def load_data():
-    global user_limits, role_limits, user_usage, like_channels, auto_like_uids, report_channels, auto_like_reports
-    if os.path.exists(DATA_FILE):
+    async def start(self):
+        if self.session is not None and not self.session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_CONNECTION_LIMIT,
+            limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            use_dns_cache=True,
+        )
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def get(self, url, **kwargs):
+        if self.session is None or self.session.closed:
+            raise RuntimeError("LikeApiClient used before start()")
+        return self.session.get(url, **kwargs)
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker driven by failure rate and latency of recent calls"""
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self):
+        self.state = self.CLOSED
+        self.results = deque(maxlen=BREAKER_WINDOW)  # True for a failed or slow call
+        self.opened_at = 0.0
+        self.probe_started = None
+        self.avg_latency = None
+        self.trips = 0
+
+    def available(self):
+        """Like allow(), but without claiming the half-open probe slot"""
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            return now - self.opened_at >= BREAKER_OPEN_SECONDS
+        if self.state == self.HALF_OPEN:
+            return self.probe_started is None or now - self.probe_started >= BREAKER_OPEN_SECONDS
+        return True
+
+    def allow(self):
+        """Return True if a call may go upstream now"""
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            if now - self.opened_at < BREAKER_OPEN_SECONDS:
+                return False
+            self.state = self.HALF_OPEN
+            self.probe_started = None
+        if self.state == self.HALF_OPEN:
+            # One probe at a time; a probe that never reported back is given up on
+            if self.probe_started is not None and now - self.probe_started < BREAKER_OPEN_SECONDS:
+                return False
+            self.probe_started = now
+        return True
+
+    def record(self, ok, latency):
+        failed = not ok or latency >= BREAKER_SLOW_CALL
+        self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+        
+        if self.state == self.HALF_OPEN:
+            if failed:
+                self.trip()
+            else:
+                self.state = self.CLOSED
+                self.results.clear()
+                log.info("🟢 Circuit breaker closed, like API recovered")
+            return
+        
+        self.results.append(failed)
+        if self.state == self.CLOSED and len(self.results) >= BREAKER_MIN_CALLS:
+            if sum(self.results) / len(self.results) >= BREAKER_FAILURE_RATE:
+                self.trip()
+
+    def trip(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.probe_started = None
+        self.trips += 1
+        log.warning("🔴 Circuit breaker opened", open_seconds=BREAKER_OPEN_SECONDS)
+
+    def describe(self):
+        failures = sum(self.results)
+        latency = f"{self.avg_latency:.2f}s" if self.avg_latency is not None else "n/a"
+        desc = f"{self.state.upper()} | failures {failures}/{len(self.results)} | avg latency {latency} | trips {self.trips}"
+        if self.state == self.OPEN:
+            remaining = max(0.0, BREAKER_OPEN_SECONDS - (time.monotonic() - self.opened_at))
+            desc += f" | probe in {remaining:.0f}s"
+        return desc
+
+class TransientApiError(Exception):
+    """Upstream failure worth retrying (timeouts, connection errors, 5xx, 429)"""
+    def __init__(self, message, kind="error"):
+        super().__init__(message)
+        self.kind = kind  # metrics label: timeout, connection or http
+
+class ApiEndpoint:
+    """One like-API deployment with its own breaker and EWMA latency/error tracking"""
+    def __init__(self, url):
+        self.url = url
+        parts = urlsplit(url)
+        self.probe_url = f"{parts.scheme}://{parts.netloc}/"
+        self.name = parts.netloc
+        self.breaker = CircuitBreaker()
+        self.latency = None
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.healthy = True
+        self.probe_failures = 0
+
+    def record(self, ok, latency):
+        self.breaker.record(ok, latency)
+        self.latency = latency if self.latency is None else (1 - ENDPOINT_EWMA_ALPHA) * self.latency + ENDPOINT_EWMA_ALPHA * latency
+        self.error_rate = (1 - ENDPOINT_EWMA_ALPHA) * self.error_rate + ENDPOINT_EWMA_ALPHA * (0.0 if ok else 1.0)
+
+    def score(self):
+        """Expected cost of sending one more request here; lower is better"""
+        latency = self.latency if self.latency is not None else ENDPOINT_DEFAULT_LATENCY
+        # Counting in-flight requests spreads concurrent (sweep) traffic over all healthy endpoints
+        return latency * (self.in_flight + 1) / (1.0 - min(self.error_rate, 0.9))
+
+    def describe(self):
+        status = "healthy" if self.healthy else "unhealthy"
+        return f"{self.name} ({status}, {self.in_flight} in flight): {self.breaker.describe()}"
+
+class ApiEndpointPool:
+    """Routes each request to the best available endpoint"""
+    def __init__(self, urls):
+        self.endpoints = [ApiEndpoint(url) for url in urls]
+        self.probe_timeout = aiohttp.ClientTimeout(total=ENDPOINT_PROBE_TIMEOUT)
+
+    def acquire(self):
+        """Pick the lowest-score endpoint that is healthy and whose breaker lets a call through"""
+        candidates = [endpoint for endpoint in self.endpoints if endpoint.healthy and endpoint.breaker.available()]
+        if not candidates:
+            # Probes can be wrong; rather try an endpoint marked unhealthy than fail outright
+            candidates = [endpoint for endpoint in self.endpoints if endpoint.breaker.available()]
+        for endpoint in sorted(candidates, key=ApiEndpoint.score):
+            if endpoint.breaker.allow():
+                return endpoint
+        return None
+
+    async def probe(self, endpoint):
+        started = time.monotonic()
         try:
-            with open(DATA_FILE, "r") as f:
-                data = json.load(f)
-                user_limits = data.get("user_limits", {})
-                role_limits = data.get("role_limits", {})
-                user_usage = data.get("user_usage", {})
-                like_channels = data.get("like_channels", {})
-                auto_like_uids = data.get("auto_like_uids", {})
-                report_channels = data.get("report_channels", {})
-                auto_like_reports = data.get("auto_like_reports", {})
+            async with api_client.get(endpoint.probe_url, timeout=self.probe_timeout) as resp:
+                ok = resp.status < 500
+        except Exception:
+            ok = False
+        
+        if ok:
+            endpoint.probe_failures = 0
+            if not endpoint.healthy:
+                log.info("🟢 API endpoint back in rotation", endpoint=endpoint.name)
+            endpoint.healthy = True
+            # Seed the latency estimate of endpoints that haven't served a request yet
+            if endpoint.latency is None:
+                endpoint.latency = time.monotonic() - started
+        else:
+            endpoint.probe_failures += 1
+            if endpoint.healthy and endpoint.probe_failures >= ENDPOINT_UNHEALTHY_AFTER:
+                endpoint.healthy = False
+                log.warning("🔴 API endpoint out of rotation", endpoint=endpoint.name, failed_probes=endpoint.probe_failures)
+
+    async def probe_all(self):
+        await asyncio.gather(*(self.probe(endpoint) for endpoint in self.endpoints))
+
+    def describe(self):
+        return "\n".join(endpoint.describe() for endpoint in self.endpoints)
+
+api_client = LikeApiClient()
+api_pool = ApiEndpointPool(API_ENDPOINTS)
+
+@tasks.loop(seconds=ENDPOINT_PROBE_INTERVAL)
+async def endpoint_health_task():
+    """Background health probes for every configured API endpoint"""
+    await api_pool.probe_all()
+    if endpoint_health_task.current_loop == 0:
+        healthy = sum(1 for endpoint in api_pool.endpoints if endpoint.healthy)
+        log.info("🧪 API warmup probe finished", healthy=healthy, endpoints=len(api_pool.endpoints))
+
+# ==== STORAGE ====
+# table: (key column, value columns); tables with one value column hold plain values
+STATE_TABLES = {
+    "user_limits": ("user_id", ("daily_limit",)),
+    "role_limits": ("role_id", ("daily_limit",)),
+    "user_usage": ("user_id", ("date", "count")),
+    "like_channels": ("guild_id", ("channel_id",)),
+    "auto_like_uids": ("uid", ("region", "nickname")),
+    "report_channels": ("guild_id", ("channel_id",)),
+    "uid_index": ("uid", ("region", "nickname", "likes", "last_seen")),
+}
+REPORT_COLUMNS = ("uid", "nickname", "region", "status", "likes", "timestamp", "at")  # at: epoch seconds
+ROLLUP_COLUMNS = ("uid", "region", "attempts", "successes", "likes")
+# Tables every cluster process must see the same contents of; uid_index is only a cache
+SHARED_TABLES = ("role_limits", "like_channels", "auto_like_uids", "report_channels")
+
+def rollup_reports(reports, rollups=()):
+    """Aggregate raw report rows into per-UID/region rollups, merged into existing rollups"""
+    totals = {(rollup["uid"], rollup["region"]): dict(rollup) for rollup in rollups}
+    for report in reports:
+        key = (report["uid"], report["region"])
+        if key not in totals:
+            totals[key] = {"uid": report["uid"], "region": report["region"], "attempts": 0, "successes": 0, "likes": 0}
+        total = totals[key]
+        total["attempts"] += 1
+        if report["status"] == "success":
+            total["successes"] += 1
+            total["likes"] += report["likes"]
+    return list(totals.values())
+
+class StateTable(MutableMapping):
+    """Dict-like view over one storage table that reports every write to its backend.
+    
+    Values must be replaced, not mutated in place, for a change to be persisted.
+    """
+    def __init__(self, storage, name, rows):
+        self.storage = storage
+        self.name = name
+        self.rows = rows
+
+    def __getitem__(self, key):
+        return self.rows[key]
+
+    def __setitem__(self, key, value):
+        self.rows[key] = value
+        self.storage.row_changed(self.name, key, value)
+
+    def __delitem__(self, key):
+        del self.rows[key]
+        self.storage.row_changed(self.name, key, None)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, key):
+        return key in self.rows
+
+class Storage(ABC):
+    """Base storage backend: write-behind flushing of pending changes in an executor"""
+    def __init__(self):
+        self.flush_lock = asyncio.Lock()
+
+    @abstractmethod
+    def load(self):
+        """Return {table name: StateTable} for every table in STATE_TABLES"""
+
+    @abstractmethod
+    def row_changed(self, table, key, value):
+        """Record a write (value None means delete)"""
+
+    def mark_dirty(self):
+        pass
+
+    @abstractmethod
+    def add_report(self, date, report):
+        ...
+
+    @abstractmethod
+    async def get_reports(self, date):
+        ...
+
+    @abstractmethod
+    async def get_rollups(self, date):
+        ...
+
+    @abstractmethod
+    async def compact_reports(self, cutoff, rollup_cutoff):
+        """Fold raw reports dated before `cutoff` into daily rollups and drop rollups
+        dated before `rollup_cutoff`. Returns the number of raw rows compacted."""
+
+    async def load_shared_changes(self):
+        """Rows of SHARED_TABLES changed by other processes, or None (only SQLite is shared)"""
+        return None
+
+    @abstractmethod
+    def take_changes(self):
+        """Detach pending changes for writing, or return None if there are none"""
+
+    @abstractmethod
+    def write_changes(self, changes):
+        """Persist detached changes (runs in an executor)"""
+
+    @abstractmethod
+    def restore_changes(self, changes):
+        """Put back changes whose write failed so the next flush retries them"""
+
+    async def flush(self):
+        """Write pending changes off the event loop"""
+        async with self.flush_lock:
+            changes = self.take_changes()
+            if changes is None:
+                return
+            started = time.monotonic()
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.write_changes, changes)
+            except Exception as e:
+                self.restore_changes(changes)
+                log.error("Error saving data", error=e)
+            storage_flush_seconds.observe(time.monotonic() - started, backend=STORAGE_BACKEND)
+
+    def flush_sync(self):
+        """Blocking flush, used once the event loop has stopped"""
+        changes = self.take_changes()
+        if changes is None:
+            return
+        try:
+            self.write_changes(changes)
         except Exception as e:
-            print(f"Error loading data: {e}")
-            save_data()
-    else:
-        save_data()
+            self.restore_changes(changes)
+            log.error("Error saving data", error=e)
 
-def save_data():
-    data = {
-        "user_limits": user_limits,
-        "role_limits": role_limits,
-        "user_usage": user_usage,
-        "like_channels": like_channels,
-        "auto_like_uids": auto_like_uids,
-        "report_channels": report_channels,
-        "auto_like_reports": auto_like_reports,
-    }
+    def close(self):
+        self.flush_sync()
+
+class JsonStorage(Storage):
+    """Original backend: all state in one JSON file, rewritten whole on every flush"""
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.dirty = False
+        self.tables = {}
+        self.reports = {}  # date: [report, ...]
+        self.rollups = {}  # date: [rollup, ...]
+
+    def load(self):
+        data = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+            except Exception as e:
+                log.error("Error loading data", path=self.path, error=e)
+                self.dirty = True
+        else:
+            self.dirty = True
+        
+        self.tables = {name: StateTable(self, name, data.get(name, {})) for name in STATE_TABLES}
+        self.reports = data.get("auto_like_reports", {})
+        self.rollups = data.get("auto_like_rollups", {})
+        return self.tables
+
+    def row_changed(self, table, key, value):
+        self.dirty = True
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def add_report(self, date, report):
+        self.reports.setdefault(date, []).append(report)
+        self.dirty = True
+
+    async def get_reports(self, date):
+        return list(self.reports.get(date, []))
+
+    async def get_rollups(self, date):
+        return list(self.rollups.get(date, []))
+
+    async def compact_reports(self, cutoff, rollup_cutoff):
+        compacted = 0
+        for date in [date for date in self.reports if date < cutoff]:
+            reports = self.reports.pop(date)
+            self.rollups[date] = rollup_reports(reports, self.rollups.get(date, []))
+            compacted += len(reports)
+        expired = [date for date in self.rollups if date < rollup_cutoff]
+        for date in expired:
+            del self.rollups[date]
+        if compacted or expired:
+            self.dirty = True
+        return compacted
+
+    def take_changes(self):
+        if not self.dirty:
+            return None
+        # Clear the flag before snapshotting so mutations made during the write mark it again
+        self.dirty = False
+        data = {
+            name: {key: dict(value) if isinstance(value, dict) else value for key, value in table.rows.items()}
+            for name, table in self.tables.items()
+        }
+        # Report rows are never modified after being appended, copying the lists is enough
+        data["auto_like_reports"] = {date: list(reports) for date, reports in self.reports.items()}
+        data["auto_like_rollups"] = {date: list(rollups) for date, rollups in self.rollups.items()}
+        return data
+
+    def write_changes(self, data):
+        # Atomic replace: temp file + rename
+        tmp_file = self.path + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.path)
+
+    def restore_changes(self, data):
+        self.dirty = True
+
+class SqliteStorage(Storage):
+    """SQLite backend in WAL mode: one indexed table per state dict, row-level upserts"""
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db_lock = threading.Lock()  # the connection is shared with executor threads
+        self.pending = {}  # (table, key): value, None for delete
+        self.pending_reports = []  # (date, report)
+        self.pending_meta = {}  # key: value
+        self.state_version = 0  # SHARED_TABLES version we last loaded or wrote
+        self.stale = False      # another process wrote SHARED_TABLES before our last write
+        self.create_schema()
+
+    def create_schema(self):
+        with self.db_lock:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            for name, (key_column, value_columns) in STATE_TABLES.items():
+                columns = ", ".join(value_columns)
+                self.db.execute(f"CREATE TABLE IF NOT EXISTS {name} ({key_column} TEXT PRIMARY KEY, {columns})")
+            self.db.execute("CREATE INDEX IF NOT EXISTS user_usage_date ON user_usage (date)")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS auto_like_reports ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, "
+                "uid TEXT, nickname TEXT, region TEXT, status TEXT, likes INTEGER, timestamp TEXT, at REAL)"
+            )
+            # Databases created before reports carried an epoch time
+            columns = {row[1] for row in self.db.execute("PRAGMA table_info(auto_like_reports)")}
+            if "at" not in columns:
+                self.db.execute("ALTER TABLE auto_like_reports ADD COLUMN at REAL")
+            self.db.execute("CREATE INDEX IF NOT EXISTS auto_like_reports_date ON auto_like_reports (date)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS auto_like_reports_uid ON auto_like_reports (uid, date)")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS auto_like_rollups ("
+                "date TEXT NOT NULL, uid TEXT NOT NULL, region TEXT NOT NULL, "
+                "attempts INTEGER, successes INTEGER, likes INTEGER, PRIMARY KEY (date, uid, region))"
+            )
+            self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def get_meta(self, key):
+        with self.db_lock:
+            row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def load(self):
+        if self.get_meta("json_migrated") is None and os.path.exists(DATA_FILE):
+            migrate_json_to_sqlite(DATA_FILE, self)
+        
+        tables = {}
+        with self.db_lock:
+            self.state_version = self.read_state_version()
+            for name in STATE_TABLES:
+                tables[name] = StateTable(self, name, self.read_table(name))
+        return tables
+
+    def read_table(self, name):
+        key_column, value_columns = STATE_TABLES[name]
+        query = f"SELECT {key_column}, {', '.join(value_columns)} FROM {name}"
+        params = ()
+        if name == "user_usage":
+            # Usage from past days is dead weight, only today's counters are loaded
+            query += " WHERE date = ?"
+            params = (get_today_date(),)
+        return {row[0]: self.from_row(value_columns, row[1:]) for row in self.db.execute(query, params)}
+
+    def read_state_version(self):
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'state_version'").fetchone()
+        return int(row[0]) if row else 0
+
+    async def load_shared_changes(self):
+        """Fresh rows of SHARED_TABLES if another process changed them since we last looked, else None.
+        
+        Local changes that are not flushed yet are laid over the fresh rows.
+        """
+        def query():
+            with self.db_lock:
+                version = self.read_state_version()
+                if version == self.state_version and not self.stale:
+                    return None
+                tables = {name: self.read_table(name) for name in SHARED_TABLES}
+                self.state_version = version
+                self.stale = False
+                return tables
+        
+        # Under the flush lock, so no flush can move the version in between
+        async with self.flush_lock:
+            tables = await asyncio.get_running_loop().run_in_executor(None, query)
+        if tables is not None:
+            for (table, key), value in self.pending.items():
+                if table in tables:
+                    if value is None:
+                        tables[table].pop(key, None)
+                    else:
+                        tables[table][key] = value
+        return tables
+
+    @staticmethod
+    def from_row(value_columns, values):
+        if len(value_columns) == 1:
+            return values[0]
+        return dict(zip(value_columns, values))
+
+    @staticmethod
+    def to_row(value_columns, value):
+        if len(value_columns) == 1:
+            return (value,)
+        return tuple(value.get(column) for column in value_columns)
+
+    def row_changed(self, table, key, value):
+        self.pending[(table, key)] = value
+
+    def add_report(self, date, report):
+        self.pending_reports.append((date, report))
+
+    async def get_reports(self, date):
+        def query():
+            with self.db_lock:
+                cursor = self.db.execute(
+                    f"SELECT {', '.join(REPORT_COLUMNS)} FROM auto_like_reports WHERE date = ? ORDER BY id", (date,)
+                )
+                return [dict(zip(REPORT_COLUMNS, row)) for row in cursor]
+        
+        reports = await asyncio.get_running_loop().run_in_executor(None, query)
+        # Rows not flushed yet are newer than anything in the table
+        reports.extend(report for report_date, report in self.pending_reports if report_date == date)
+        return reports
+
+    async def get_rollups(self, date):
+        def query():
+            with self.db_lock:
+                cursor = self.db.execute(
+                    f"SELECT {', '.join(ROLLUP_COLUMNS)} FROM auto_like_rollups WHERE date = ?", (date,)
+                )
+                return [dict(zip(ROLLUP_COLUMNS, row)) for row in cursor]
+        
+        return await asyncio.get_running_loop().run_in_executor(None, query)
+
+    async def compact_reports(self, cutoff, rollup_cutoff):
+        def compact():
+            with self.db_lock:
+                self.db.execute("BEGIN IMMEDIATE")
+                try:
+                    self.db.execute(
+                        "INSERT INTO auto_like_rollups (date, uid, region, attempts, successes, likes) "
+                        "SELECT date, uid, region, COUNT(*), SUM(status = 'success'), "
+                        "SUM(CASE WHEN status = 'success' THEN likes ELSE 0 END) "
+                        "FROM auto_like_reports WHERE date < ? GROUP BY date, uid, region "
+                        "ON CONFLICT (date, uid, region) DO UPDATE SET "
+                        "attempts = attempts + excluded.attempts, successes = successes + excluded.successes, "
+                        "likes = likes + excluded.likes",
+                        (cutoff,),
+                    )
+                    compacted = self.db.execute("DELETE FROM auto_like_reports WHERE date < ?", (cutoff,)).rowcount
+                    self.db.execute("DELETE FROM auto_like_rollups WHERE date < ?", (rollup_cutoff,))
+                    self.db.execute("COMMIT")
+                except Exception:
+                    self.db.execute("ROLLBACK")
+                    raise
+            return compacted
+        
+        # Pending rows have to be in the table before they can be compacted
+        await self.flush()
+        async with self.flush_lock:
+            return await asyncio.get_running_loop().run_in_executor(None, compact)
+
+    def take_changes(self):
+        if not self.pending and not self.pending_reports and not self.pending_meta:
+            return None
+        changes = (self.pending, self.pending_reports, self.pending_meta)
+        self.pending = {}
+        self.pending_reports = []
+        self.pending_meta = {}
+        return changes
+
+    def write_changes(self, changes):
+        pending, reports, meta = changes
+        with self.db_lock:
+            # IMMEDIATE takes the write lock up front, so cluster processes queue instead of failing
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                version = None
+                if any(table in SHARED_TABLES for table, _ in pending):
+                    # Other cluster processes reload SHARED_TABLES when this version moves
+                    version = self.read_state_version()
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('state_version', ?)", (str(version + 1),)
+                    )
+                for (table, key), value in pending.items():
+                    key_column, value_columns = STATE_TABLES[table]
+                    if value is None:
+                        self.db.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (key,))
+                    else:
+                        placeholders = ", ".join("?" * (len(value_columns) + 1))
+                        self.db.execute(
+                            f"INSERT OR REPLACE INTO {table} ({key_column}, {', '.join(value_columns)}) "
+                            f"VALUES ({placeholders})",
+                            (key, *self.to_row(value_columns, value)),
+                        )
+                if reports:
+                    self.db.executemany(
+                        f"INSERT INTO auto_like_reports (date, {', '.join(REPORT_COLUMNS)}) "
+                        f"VALUES ({', '.join('?' * (len(REPORT_COLUMNS) + 1))})",
+                        [(date, *(report.get(column) for column in REPORT_COLUMNS)) for date, report in reports],
+                    )
+                for key, value in meta.items():
+                    self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+            if version is not None:
+                if version != self.state_version:
+                    self.stale = True
+                self.state_version = version + 1
+
+    def restore_changes(self, changes):
+        pending, reports, meta = changes
+        # Anything written since the failed flush is newer and wins
+        for key, value in pending.items():
+            self.pending.setdefault(key, value)
+        for key, value in meta.items():
+            self.pending_meta.setdefault(key, value)
+        self.pending_reports[:0] = reports
+
+    def close(self):
+        super().close()
+        with self.db_lock:
+            self.db.close()
+
+def migrate_json_to_sqlite(json_path, sqlite_storage):
+    """One-shot import of a legacy data.json into the SQLite backend"""
+    try:
+        with open(json_path, "r") as f:
+            data = json.load(f)
+    except Exception as e:
+        log.error("Error reading JSON data for migration", path=json_path, error=e)
+        return
+    
+    for name in STATE_TABLES:
+        for key, value in data.get(name, {}).items():
+            sqlite_storage.row_changed(name, key, value)
+    for date, reports in data.get("auto_like_reports", {}).items():
+        for report in reports:
+            sqlite_storage.add_report(date, report)
+    rollups = [
+        (date, *(rollup[column] for column in ROLLUP_COLUMNS))
+        for date, day_rollups in data.get("auto_like_rollups", {}).items()
+        for rollup in day_rollups
+    ]
+    if rollups:
+        # Idempotent, so a migration interrupted before its marker is committed can safely rerun
+        with sqlite_storage.db_lock:
+            sqlite_storage.db.executemany(
+                f"INSERT OR REPLACE INTO auto_like_rollups (date, {', '.join(ROLLUP_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)",
+                rollups,
+            )
+    
+    # The migration marker is committed in the same transaction as the data
+    sqlite_storage.pending_meta["json_migrated"] = datetime.now().isoformat()
+    sqlite_storage.flush_sync()
+    log.info("📦 Migrated JSON data into SQLite storage", path=json_path)
+
+def open_storage():
+    """Create the storage backend selected by STORAGE_BACKEND"""
+    if STORAGE_BACKEND == "json":
+        return JsonStorage(DATA_FILE)
+    return SqliteStorage(DB_FILE)
+
+storage: Storage | None = None
+
+# ==== USAGE STORE ====
+class CompactIntMap:
+    """int -> int map kept in sorted typed arrays, about 12 bytes per entry.
+    
+    New keys go to a small dict and are merged into the arrays once it grows
+    past an eighth of the array size, keeping inserts amortised O(1).
+    """
+    MIN_MERGE = 4096
+
+    def __init__(self, value_type="I"):
+        self.keys = array("Q")
+        self.values = array(value_type)
+        self.pending = {}
+
+    def get(self, key, default=None):
+        value = self.pending.get(key)
+        if value is not None:
+            return value
+        index = bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            return self.values[index]
+        return default
+
+    def __setitem__(self, key, value):
+        index = bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            self.values[index] = value
+            return
+        self.pending[key] = value
+        if len(self.pending) >= max(self.MIN_MERGE, len(self.keys) // 8):
+            self.merge()
+
+    def __len__(self):
+        return len(self.keys) + len(self.pending)
+
+    def items(self):
+        self.merge()
+        return zip(self.keys, self.values)
+
+    def merge(self):
+        if not self.pending:
+            return
+        keys = array("Q")
+        values = array(self.values.typecode)
+        pending = sorted(self.pending.items())
+        position = 0
+        for key, value in zip(self.keys, self.values):
+            while position < len(pending) and pending[position][0] < key:
+                keys.append(pending[position][0])
+                values.append(pending[position][1])
+                position += 1
+            keys.append(key)
+            values.append(value)
+        for key, value in pending[position:]:
+            keys.append(key)
+            values.append(value)
+        self.keys, self.values, self.pending = keys, values, {}
+
+    def clear(self):
+        self.keys = array("Q")
+        self.values = array(self.values.typecode)
+        self.pending = {}
+
+    def snapshot(self):
+        self.merge()
+        return self.keys[:], self.values[:]
+
+    @classmethod
+    def from_arrays(cls, keys, values):
+        instance = cls(values.typecode)
+        instance.keys = keys
+        instance.values = values
+        return instance
+
+class UsageStore:
+    """Daily usage counters and per-user limits for every user, in one binary file.
+    
+    All counters share a single day field; a new day drops them in one step.
+    File layout (little-endian): header, then the key and value arrays of
+    usage and limits back to back.
+    """
+    HEADER = struct.Struct("<4sIQQ")  # magic, day ordinal, usage entries, limit entries
+    MAGIC = b"LBU1"
+
+    def __init__(self, path):
+        self.path = path
+        self.day = 0
+        self.usage = CompactIntMap()   # user_id: successful likes on `day`
+        self.limits = CompactIntMap("i")  # user_id: individual daily limit
+        self.dirty = False
+        self.flush_lock = asyncio.Lock()
+
+    def start_day(self, day):
+        if day != self.day:
+            self.day = day
+            self.usage.clear()
+            self.dirty = True
+
+    def load(self):
+        """Read the store file; returns False if there is none yet"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "rb") as f:
+            header = f.read(self.HEADER.size)
+            if len(header) < self.HEADER.size:
+                raise ValueError(f"{self.path} is truncated")
+            magic, day, usage_count, limit_count = self.HEADER.unpack(header)
+            if magic != self.MAGIC:
+                raise ValueError(f"{self.path} is not a usage store file")
+            arrays = []
+            for typecode, count in (("Q", usage_count), ("I", usage_count), ("Q", limit_count), ("i", limit_count)):
+                values = array(typecode)
+                data = f.read(count * values.itemsize)
+                if len(data) < count * values.itemsize:
+                    raise ValueError(f"{self.path} is truncated")
+                values.frombytes(data)
+                if sys.byteorder != "little":
+                    values.byteswap()
+                arrays.append(values)
+        self.day = day
+        self.usage = CompactIntMap.from_arrays(arrays[0], arrays[1])
+        self.limits = CompactIntMap.from_arrays(arrays[2], arrays[3])
+        self.dirty = False
+        return True
+
+    def take_snapshot(self):
+        if not self.dirty:
+            return None
+        self.dirty = False
+        return (self.day, *self.usage.snapshot(), *self.limits.snapshot())
+
+    def write_snapshot(self, snapshot):
+        day, usage_keys, usage_values, limit_keys, limit_values = snapshot
+        tmp_file = self.path + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, day, len(usage_keys), len(limit_keys)))
+            for values in (usage_keys, usage_values, limit_keys, limit_values):
+                if sys.byteorder != "little":
+                    values.byteswap()
+                values.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.path)
+
+    async def flush(self):
+        async with self.flush_lock:
+            try:
+                # Taking the snapshot merges pending entries, which can fail too
+                snapshot = self.take_snapshot()
+                if snapshot is None:
+                    return
+                await asyncio.get_running_loop().run_in_executor(None, self.write_snapshot, snapshot)
+            except Exception as e:
+                self.dirty = True
+                log.error("Error saving usage store", path=self.path, error=e)
+
+    def flush_sync(self):
+        try:
+            snapshot = self.take_snapshot()
+            if snapshot is not None:
+                self.write_snapshot(snapshot)
+        except Exception as e:
+            self.dirty = True
+            log.error("Error saving usage store", path=self.path, error=e)
+
+    def import_tables(self, usage_table, limit_table):
+        """One-shot import of the legacy per-user dicts; the tables are emptied afterwards"""
+        today = datetime.now()
+        self.start_day(today.toordinal())
+        today_str = today.strftime("%Y-%m-%d")
+        for user_id, usage in usage_table.items():
+            if usage["date"] == today_str:
+                self.usage[int(user_id)] = usage["count"]
+        for user_id, limit in limit_table.items():
+            self.limits[int(user_id)] = limit
+        self.dirty = True
+        imported = (len(usage_table), len(limit_table))
+        usage_table.clear()
+        limit_table.clear()
+        log.info("📦 Imported usage and limits into the compact usage store", usage=imported[0], limits=imported[1])
+
+usage_store = UsageStore(USAGE_FILE)
+
+# ==== LOAD/SAVE DATA ====
+def load_data():
+    global storage, user_limits, role_limits, user_usage, like_channels, auto_like_uids, report_channels
+    if storage is not None:
+        storage.close()
+    storage = open_storage()
+    tables = storage.load()
+    user_limits = tables["user_limits"]
+    role_limits = tables["role_limits"]
+    user_usage = tables["user_usage"]
+    like_channels = tables["like_channels"]
+    auto_like_uids = tables["auto_like_uids"]
+    report_channels = tables["report_channels"]
+    uid_index.bind(tables["uid_index"])
+    auto_like_index.reset(auto_like_uids)
+    
+    usage_store.flush_sync()
     try:
-        with open(DATA_FILE, "w") as f:
-            json.dump(data, f, indent=4)
+        loaded = usage_store.load()
     except Exception as e:
-        print(f"Error saving data: {e}")
+        # Keep the unreadable file for recovery; the rebuilt store would overwrite it on the next flush
+        corrupt_file = f"{usage_store.path}.corrupt-{int(time.time())}"
+        os.replace(usage_store.path, corrupt_file)
+        log.error("Error loading usage store, moved it aside", path=usage_store.path, moved_to=corrupt_file, error=e)
+        loaded = False
+    if not loaded or user_usage or user_limits:
+        usage_store.import_tables(user_usage, user_limits)
+    if CLUSTERED:
+        # Counters and limits are shared through the database, the usage file is only imported once
+        quota.load(storage, role_limits)
+        quota.import_usage_store(usage_store)
+    else:
+        quota.load(usage_store, role_limits)
+
+async def refresh_shared_state():
+    """Pick up SHARED_TABLES rows written by other cluster processes"""
+    tables = await storage.load_shared_changes()
+    if tables is None:
+        return
+    for name, table in (("role_limits", role_limits), ("like_channels", like_channels),
+                        ("auto_like_uids", auto_like_uids), ("report_channels", report_channels)):
+        table.rows = tables[name]
+    auto_like_index.reset(auto_like_uids)
+    auto_like_scheduler.sync(auto_like_uids)
+    quota.set_role_table(role_limits)
+    log.info("🔄 Shared state reloaded", auto_like_uids=len(auto_like_uids), report_channels=len(report_channels))
+
+def save_data():
+    """Ask the storage backend to persist recent changes on the next flush"""
+    if storage is not None:
+        storage.mark_dirty()
+
+async def flush_data():
+    """Write pending changes to disk without blocking the event loop"""
+    if storage is not None:
+        await storage.flush()
+    # Cluster processes keep their counters in the shared database; after the one-time
+    # import none of them writes usage.bin, or they would race on its tmp file
+    if not CLUSTERED:
+        await usage_store.flush()
+
+@tasks.loop(seconds=SAVE_INTERVAL)
+async def persist_task():
+    """Write-behind loop: combines all mutations since the last tick into one write"""
+    await flush_data()
+    if CLUSTERED:
+        await refresh_shared_state()
 
 # ==== HELPERS ====
+def next_api_reset():
+    """Epoch time of the next upstream daily like reset"""
+    tz = API_RESET_TZ
+    now = datetime.now(tz)
+    day = now.date()
+    reset = tz.localize(datetime(day.year, day.month, day.day, API_RESET_HOUR))
+    if reset <= now:
+        day += timedelta(days=1)
+        reset = tz.localize(datetime(day.year, day.month, day.day, API_RESET_HOUR))
+    return reset.timestamp()
+
+def last_api_reset():
+    """Epoch time of the most recent upstream daily like reset"""
+    tz = API_RESET_TZ
+    now = datetime.now(tz)
+    day = now.date()
+    reset = tz.localize(datetime(day.year, day.month, day.day, API_RESET_HOUR))
+    if reset > now:
+        day -= timedelta(days=1)
+        reset = tz.localize(datetime(day.year, day.month, day.day, API_RESET_HOUR))
+    return reset.timestamp()
+
+class MaxlikeCache:
+    """LRU cache of maxlike results, each valid until the next upstream daily reset"""
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()  # (uid, region): (expires_at, result)
+        self.reset_at = 0.0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.time() >= expires_at:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        if time.time() >= self.reset_at:
+            self.reset_at = next_api_reset()
+        self.entries[key] = (self.reset_at, result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+maxlike_cache = MaxlikeCache(MAXLIKE_CACHE_SIZE)
+inflight_requests = {}  # (uid, region): asyncio.Task shared by concurrent callers
+
+# ==== UID INDEX ====
+class SortedKeys:
+    """Sorted list of string keys for prefix lookups in O(log n + matches)"""
+    def __init__(self):
+        self.keys = []
+
+    def reset(self, keys):
+        self.keys = sorted(keys)
+
+    def add(self, key):
+        index = bisect_left(self.keys, key)
+        if index == len(self.keys) or self.keys[index] != key:
+            self.keys.insert(index, key)
+
+    def discard(self, key):
+        index = bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            del self.keys[index]
+
+    def prefix(self, prefix, limit):
+        index = bisect_left(self.keys, prefix)
+        matches = []
+        while index < len(self.keys) and len(matches) < limit and self.keys[index].startswith(prefix):
+            matches.append(self.keys[index])
+            index += 1
+        return matches
+
+def normalize_region(region):
+    """Map an upstream region code to ours, or None if it isn't one we know"""
+    if not region:
+        return None
+    region = str(region).upper()
+    region = "IND" if region == "IN" else region
+    return region if region in VALID_REGIONS and region != "AUTO" else None
+
+class UidIndex:
+    """What like responses taught us about each UID: region, nickname, like count, last seen"""
+    def __init__(self):
+        self.table = {}
+        self.sorted = SortedKeys()
+
+    def bind(self, table):
+        self.table = table
+        self.sorted.reset(table)
+
+    def learn(self, uid, response, region=None):
+        """Record a like response; region is only passed when it is known to be the UID's real one"""
+        entry = self.table.get(uid) or {}
+        self.table[uid] = {
+            "region": normalize_region(region) or entry.get("region"),
+            "nickname": response.get("PlayerNickname") or entry.get("nickname"),
+            "likes": response.get("LikesafterCommand", entry.get("likes")),
+            "last_seen": int(time.time()),
+        }
+        self.sorted.add(uid)
+
+    def resolve_region(self, uid, region):
+        """Use the learned region instead of AUTO, so upstream doesn't resolve it again"""
+        if region != "AUTO":
+            return region
+        entry = self.table.get(uid)
+        if entry is None:
+            return "AUTO"
+        return entry.get("region") or "AUTO"
+
+    def complete(self, prefix, limit=25):
+        return self.sorted.prefix(prefix, limit)
+
+uid_index = UidIndex()
+
+class AutoLikeIndex:
+    """Sorted views of auto_like_uids, updated on every add/remove instead of rebuilt per lookup.
+    
+    `uids` serves UID prefix autocomplete; `names` holds sorted (nickname, uid) lists, one over
+    all UIDs (key None) and one per region, so a filtered listing is one contiguous slice.
+    """
+    def __init__(self):
+        self.uids = SortedKeys()
+        self.names = {None: []}
+
+    @staticmethod
+    def name_key(uid, data):
+        return (data["nickname"].lower(), uid)
+
+    def reset(self, table):
+        self.uids.reset(table)
+        self.names = {None: []}
+        for uid, data in table.items():
+            self.names[None].append(self.name_key(uid, data))
+            self.names.setdefault(data["region"], []).append(self.name_key(uid, data))
+        for entries in self.names.values():
+            entries.sort()
+
+    def update(self, uid, old, new):
+        """Move uid from its old entry (None if it's new) to its new one (None if removed)"""
+        if old is not None:
+            key = self.name_key(uid, old)
+            for entries in (self.names[None], self.names.get(old["region"], [])):
+                index = bisect_left(entries, key)
+                if index < len(entries) and entries[index] == key:
+                    del entries[index]
+            if new is None:
+                self.uids.discard(uid)
+        if new is not None:
+            key = self.name_key(uid, new)
+            for entries in (self.names[None], self.names.setdefault(new["region"], [])):
+                entries.insert(bisect_left(entries, key), key)
+            self.uids.add(uid)
+
+    def name_range(self, region=None, nickname=""):
+        """Return (entries, start, end): the slice of entries matching the filters"""
+        entries = self.names.get(region, [])
+        prefix = nickname.lower()
+        if not prefix:
+            return entries, 0, len(entries)
+        start = bisect_left(entries, (prefix,))
+        # The highest code point sorts after every character a nickname continues with, emoji included
+        end = bisect_left(entries, (prefix + "\U0010ffff",), start)
+        return entries, start, end
+
+auto_like_index = AutoLikeIndex()
+
 async def fetch_like(uid, region="AUTO"):
-    """Fetch like from API"""
-    global session
-    if session is None or session.closed:
-        session = aiohttp.ClientSession()
+    """Fetch like from API, answering known-exhausted UIDs locally and sharing
+    one upstream request between concurrent callers for the same UID"""
+    started = time.monotonic()
+    region = uid_index.resolve_region(uid, region)
+    key = (uid, region)
+    cached = maxlike_cache.get(key)
+    if cached is not None:
+        fetch_like_seconds.observe(time.monotonic() - started, outcome="cached")
+        return cached
+    
+    task = inflight_requests.get(key)
+    if task is None:
+        task = asyncio.ensure_future(request_like(uid, region))
+        inflight_requests[key] = task
+        task.add_done_callback(lambda _: inflight_requests.pop(key, None))
+    # Shield so one caller giving up doesn't cancel the request for everyone else
+    result = await asyncio.shield(task)
+    fetch_like_seconds.observe(time.monotonic() - started, outcome=result["status"] if result else "error")
+    return result
+
+async def request_like(uid, region="AUTO"):
+    """Send a like request upstream through the endpoint pool, retrying transient
+    failures with jittered exponential backoff"""
+    first_attempt = time.monotonic()
+    for attempt in range(RETRY_ATTEMPTS):
+        endpoint = api_pool.acquire()
+        if endpoint is None:
+            log.warning("⚡ All API circuit breakers open, skipping API call", uid=uid)
+            return None
+        
+        started = time.monotonic()
+        # Later attempts only get what is left of the budget, not a full HTTP_TIMEOUT each
+        remaining = RETRY_BUDGET - (started - first_attempt)
+        timeout = None
+        if remaining < HTTP_TIMEOUT:
+            timeout = aiohttp.ClientTimeout(total=remaining, connect=min(HTTP_CONNECT_TIMEOUT, remaining))
+        endpoint.in_flight += 1
+        try:
+            result = await call_like_api(endpoint.url, uid, region, timeout=timeout)
+            error = None
+        except TransientApiError as e:
+            error = e
+        finally:
+            endpoint.in_flight -= 1
+        
+        if error is None:
+            # Permanent failures (bad UID, malformed reply) are not the upstream being unhealthy
+            endpoint.record(True, time.monotonic() - started)
+            api_attempts_total.inc(endpoint=endpoint.name, outcome=result["status"] if result else "rejected")
+            if result:
+                # A region the user typed is only trusted once likes were actually sent with it
+                region_seen = result.get("upstream_region")
+                if region_seen is None and result["status"] == "success":
+                    region_seen = result["response"]["Region"]
+                uid_index.learn(uid, result["response"], region_seen)
+            return result
+        
+        endpoint.record(False, time.monotonic() - started)
+        api_attempts_total.inc(endpoint=endpoint.name, outcome=error.kind)
+        delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+        if attempt + 1 >= RETRY_ATTEMPTS or time.monotonic() + delay - first_attempt > RETRY_BUDGET:
+            log.warning("💥 API request failed", uid=uid, region=region, error=error)
+            return None
+        log.info("🔁 Retrying API request", uid=uid, delay=round(delay, 2), error=error)
+        await asyncio.sleep(delay)
+    return None
+
+async def call_like_api(api_url, uid, region="AUTO", timeout=None):
+    """Send one like request upstream and normalise the response.
     
+    Returns None for permanent failures and raises TransientApiError for retryable ones.
+    `timeout` overrides the session's ClientTimeout for this request.
+    """
     # Convert IND to IN for API compatibility
     api_region = "IN" if region == "IND" else region
     
-    url = API_BASE.format(uid=uid, region=api_region)
-    print(f"🔗 Connecting to API: {url}")
-    print(f"🌍 Region: {region} -> API Region: {api_region}")
+    url = api_url.format(uid=uid, region=api_region)
+    log.debug("🔗 Connecting to API", url=url, region=region, api_region=api_region)
     
     try:
-        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
-            print(f"📡 API Response Status: {resp.status}")
+        async with api_client.get(url, timeout=timeout or api_client.timeout) as resp:
+            log.debug("📡 API response", uid=uid, status=resp.status)
             
             if resp.status == 200:
                 data = await resp.json()
-                print(f"📊 API Data: {data}")
+                log.debug("📊 API data", uid=uid, payload=data)
                 
                 # Check if API response is valid
                 if data and "status" in data:
-                    print(f"✅ Valid API response received for UID {uid}")
+                    log.debug("✅ Valid API response received", uid=uid)
                     
                     # The REAL check: How many likes were actually sent?
                     likes_sent = data.get("LikesGivenByAPI", 0)
-                    print(f"🎯 Likes actually sent by API: {likes_sent}")
+                    log.debug("🎯 Likes actually sent by API", uid=uid, likes=likes_sent)
+                    
+                    # Region upstream reported, if any; the one we asked for may be wrong for maxlike
+                    upstream_region = normalize_region(data.get("Region"))
                     
                     # Create response data
                     response_data = {
                         "PlayerNickname": data.get("PlayerNickname", "Unknown"),
                         "UID": data.get("UID", uid),
-                        "Region": region,  # Use original region (IND)
+                        # Use original region (IND), or the one upstream resolved for AUTO
+                        "Region": (upstream_region or region) if region == "AUTO" else region,
                         "LikesGivenByAPI": likes_sent,
                         "LikesbeforeCommand": data.get("LikesbeforeCommand", 0),
                         "LikesafterCommand": data.get("LikesafterCommand", 0)
@@ -131,172 +1730,384 @@ async def fetch_like(uid, region="AUTO"):
                         # SUCCESS! Likes were actually sent
                         converted_data = {
                             "status": "success",
-                            "response": response_data
+                            "response": response_data,
+                            "upstream_region": upstream_region
                         }
-                        print(f"✅ SUCCESS: {likes_sent} likes sent to {data.get('PlayerNickname', 'Unknown')}")
+                        log.info("✅ Likes sent", uid=uid, region=region, likes=likes_sent, nickname=response_data["PlayerNickname"])
                     else:
                         # NO LIKES SENT - Show "already received likes" message
                         converted_data = {
                             "status": "maxlike",
-                            "response": response_data
+                            "response": response_data,
+                            "upstream_region": upstream_region
                         }
-                        print(f"🚫 NO LIKES SENT: UID {uid} has reached daily API limit")
+                        log.info("🚫 No likes sent, UID has reached daily API limit", uid=uid, region=region)
+                        maxlike_cache.put((uid, region), converted_data)
                     
-                    print(f"✅ Converted data: {converted_data}")
+                    log.debug("✅ Converted data", uid=uid, result=converted_data)
                     return converted_data
                 else:
-                    print(f"❌ Invalid API response format: {data}")
+                    log.warning("❌ Invalid API response format", uid=uid)
+                    log.debug("❌ Invalid API payload", uid=uid, payload=data)
                     return None
             else:
-                print(f"❌ API returned HTTP {resp.status}")
                 response_text = await resp.text()
-                print(f"📄 Response body: {response_text}")
+                log.warning("❌ API returned an error status", uid=uid, status=resp.status)
+                log.debug("📄 API error body", uid=uid, body=response_text)
+                if resp.status >= 500 or resp.status == 429:
+                    raise TransientApiError(f"HTTP {resp.status}", kind="http")
                 return None
                 
     except asyncio.TimeoutError:
-        print(f"⏱️ API request timed out for UID {uid} (Region: {region})")
-        return None
+        log.warning("⏱️ API request timed out", uid=uid, region=region)
+        raise TransientApiError("timeout", kind="timeout")
+    except aiohttp.ClientError as e:
+        log.warning("💥 API connection error", uid=uid, error=e)
+        raise TransientApiError(str(e) or type(e).__name__, kind="connection")
+    except TransientApiError:
+        raise
     except Exception as e:
-        print(f"💥 API connection error for UID {uid}: {e}")
+        log.warning("💥 API connection error", uid=uid, error=e)
         return None
 
 async def test_api_connection():
     """Test API connection"""
-    print("🧪 Testing API connection...")
+    log.info("🧪 Testing API connection")
     test_uid = "6427406194"
     test_region = "IND"
     
-    result = await fetch_like(test_uid, test_region)
+    # Straight to upstream: a cached maxlike would say nothing about connectivity
+    result = await request_like(test_uid, test_region)
     
     if result:
-        print(f"✅ API Test Success: {result}")
+        log.info("✅ API test succeeded", status=result["status"])
         return True
     else:
-        print("❌ API Test Failed")
+        log.warning("❌ API test failed")
         return False
 
 def get_today_date():
     return datetime.now().strftime("%Y-%m-%d")
 
-def get_region_flag(region):
-    """Get flag emoji for region"""
-    flags = {
-        "BD": "🇧🇩", "IND": "🇮🇳", "ID": "🇮🇩", "TH": "🇹🇭", 
-        "VN": "🇻🇳", "SG": "🇸🇬", "MY": "🇲🇾", "PH": "🇵🇭",
-        "BR": "🇧🇷", "RU": "🇷🇺", "US": "🇺🇸", "PK": "🇵🇰",
-        "EG": "🇪🇬", "SA": "🇸🇦", "ME": "🇲🇪", "AUTO": "🌍"
-    }
-    return flags.get(region.upper(), "🌍")
+# ==== QUOTAS ====
+QuotaCheck = namedtuple("QuotaCheck", "allowed used limit day")
 
-def get_user_daily_limit(user):
-    """Get the daily limit for a user based on roles and individual settings"""
-    user_id = str(user.id)
-    
-    # Check if user has individual limit set
-    if user_id in user_limits:
-        return user_limits[user_id]
-    
-    # Check role-based limits (highest role limit takes precedence)
-    max_role_limit = 0
-    for role in user.roles:
-        role_id = str(role.id)
-        if role_id in role_limits:
-            max_role_limit = max(max_role_limit, role_limits[role_id])
-    
-    if max_role_limit > 0:
-        return max_role_limit
-    
-    # Return default limit
-    return DEFAULT_DAILY_LIMIT
+class QuotaBusyError(Exception):
+    """The shared quota database stayed locked by another process for longer than QUOTA_BUSY_TIMEOUT"""
 
-def get_user_usage_today(user_id):
-    """Get user's usage count for today"""
-    user_id = str(user_id)
-    today = get_today_date()
-    
-    if user_id not in user_usage:
-        user_usage[user_id] = {"date": today, "count": 0}
-        return 0
-    
-    if user_usage[user_id]["date"] != today:
-        user_usage[user_id] = {"date": today, "count": 0}
-        return 0
+class QuotaService:
+    """Daily like quotas with cached effective limits and per-day counters.
     
-    return user_usage[user_id]["count"]
+    Counters live in the compact usage store for the current day only; the day
+    number is recomputed once per rollover, not on every request. A reserved
+    unit counts against the limit until it is committed (success) or released.
+    """
+    def __init__(self):
+        self.store = None
+        self.day = None
+        self.next_rollover = 0.0
+        self.reserved = {}   # user_id: requests in flight
+        self.limits = {}     # user_id: {guild_id: cached effective daily limit}, roles differ per guild
+        self.role_index = {}  # role_id: daily limit
 
-def increment_user_usage(user_id):
-    """Increment user's usage count for today"""
-    user_id = str(user_id)
-    today = get_today_date()
-    
-    if user_id not in user_usage or user_usage[user_id]["date"] != today:
-        user_usage[user_id] = {"date": today, "count": 1}
-    else:
-        user_usage[user_id]["count"] += 1
-    
-    save_data()
+    def load(self, store, role_table):
+        self.store = store
+        self.set_role_table(role_table)
+        self.next_rollover = 0.0
+        self.refresh_day()
 
-# ==== SUCCESS EMBED ====
-def make_success_embed(data, user, remaining_limit):
-    r = data["response"]
-    
-    # Get current time in Nepal timezone
-    tz = pytz.timezone("Asia/Kathmandu")
-    current_time = datetime.now(tz)
-    date_str = current_time.strftime("%Y-%m-%d")
-    time_str = current_time.strftime("%H:%M:%S")
+    def set_role_table(self, role_table):
+        self.role_index = {int(role_id): limit for role_id, limit in role_table.items()}
+        self.invalidate()
+
+    def refresh_day(self):
+        """Roll over to a new day if midnight has passed; O(1) otherwise"""
+        if time.time() < self.next_rollover:
+            return
+        now = datetime.now()
+        self.day = now.toordinal()
+        tomorrow = now.date() + timedelta(days=1)
+        self.next_rollover = datetime(tomorrow.year, tomorrow.month, tomorrow.day).timestamp()
+        
+        # Everything held so far belongs to a past day, drop it in bulk
+        self.start_day()
+        self.reserved = {}
+        self.limits = {}
+
+    def start_day(self):
+        self.store.start_day(self.day)
+
+    async def user_limit(self, user_id):
+        """Individual limit set with /setlimit, or None"""
+        return self.store.limits.get(user_id)
+
+    async def limit_for(self, member):
+        """Effective daily limit: individual limit, else highest role limit, else the default"""
+        guild = getattr(member, "guild", None)
+        guild_id = guild.id if guild is not None else 0  # 0 for DMs
+        limit = self.limits.get(member.id, {}).get(guild_id)
+        if limit is not None:
+            return limit
+        
+        limit = await self.user_limit(member.id)
+        if limit is None:
+            limit = max((self.role_index.get(role.id, 0) for role in getattr(member, "roles", ())), default=0)
+            if limit <= 0:
+                limit = DEFAULT_DAILY_LIMIT
+        self.limits.setdefault(member.id, {})[guild_id] = limit
+        return limit
+
+    async def used(self, user_id):
+        self.refresh_day()
+        return self.store.usage.get(user_id, 0)
+
+    async def reserve(self, member, count=1):
+        """Check the limit and take count units in a single step, so concurrent requests can't overshoot.
+        
+        All or nothing: a batch that doesn't fit in the remaining quota reserves nothing.
+        """
+        self.refresh_day()
+        limit = await self.limit_for(member)
+        used = self.store.usage.get(member.id, 0) + self.reserved.get(member.id, 0)
+        if used + count > limit:
+            return QuotaCheck(False, used, limit, self.day)
+        self.reserved[member.id] = self.reserved.get(member.id, 0) + count
+        return QuotaCheck(True, used + count, limit, self.day)
+
+    async def release(self, user_id, day, count=1):
+        """Give back reserved units (the requests didn't send likes)"""
+        if day != self.day:
+            return
+        remaining = self.reserved.get(user_id, 0) - count
+        if remaining > 0:
+            self.reserved[user_id] = remaining
+        else:
+            self.reserved.pop(user_id, None)
+
+    async def commit(self, user_id, day):
+        """Turn a reserved unit into a charged like and persist the new count"""
+        if day != self.day:
+            return
+        await self.release(user_id, day)
+        await self.charge(user_id)
+
+    async def charge(self, user_id):
+        self.refresh_day()
+        self.store.usage[user_id] = self.store.usage.get(user_id, 0) + 1
+        self.store.dirty = True
+
+    async def set_user_limit(self, user_id, limit):
+        self.store.limits[user_id] = limit
+        self.store.dirty = True
+        self.invalidate(user_id)
+
+    def invalidate(self, user_id=None, guild_id=None):
+        """Drop cached limits for one user in one guild, one user everywhere, or everyone"""
+        if user_id is None:
+            self.limits.clear()
+        elif guild_id is None:
+            self.limits.pop(user_id, None)
+        else:
+            self.limits.get(user_id, {}).pop(guild_id, None)
+
+    def set_role_limit(self, role_id, limit):
+        self.role_index[role_id] = limit
+        # Any member may hold the role
+        self.invalidate()
+
+class SharedQuotaService(QuotaService):
+    """Quotas for a cluster: counters and individual limits live in the shared SQLite file.
     
-    region_flag = get_region_flag(r.get('Region', 'AUTO'))
-    desc = f"""
+    A reservation is charged straight away by one conditional upsert, which is atomic
+    across processes, and refunded if the request sends no likes. Queries run in the
+    executor on a connection of their own, so a write lock held by another process
+    never blocks the event loop or the storage connection.
+    """
+    def load(self, store, role_table):
+        # Waits long for the lock at startup; import_usage_store switches to QUOTA_BUSY_TIMEOUT when done
+        self.db = sqlite3.connect(store.path, timeout=QUOTA_STARTUP_TIMEOUT, check_same_thread=False, isolation_level=None)
+        self.db_lock = threading.Lock()  # the connection is shared with executor threads
+        self.purge_day = None  # rows of days before this are deleted by the next query
+        with self.db_lock:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS quota_usage ("
+                "user_id INTEGER NOT NULL, day INTEGER NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (user_id, day))"
+            )
+            self.db.execute("CREATE TABLE IF NOT EXISTS quota_limits (user_id INTEGER PRIMARY KEY, daily_limit INTEGER)")
+        super().load(store, role_table)
+
+    def import_usage_store(self, usage_store):
+        """One-shot copy of the single-process usage store into the shared tables"""
+        with self.db_lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                if self.db.execute("SELECT 1 FROM meta WHERE key = 'quota_imported'").fetchone() is None:
+                    self.db.executemany(
+                        "INSERT OR IGNORE INTO quota_limits (user_id, daily_limit) VALUES (?, ?)",
+                        usage_store.limits.items(),
+                    )
+                    self.db.executemany(
+                        "INSERT OR IGNORE INTO quota_usage (user_id, day, count) VALUES (?, ?, ?)",
+                        ((user_id, usage_store.day, count) for user_id, count in usage_store.usage.items()),
+                    )
+                    self.db.execute("INSERT INTO meta (key, value) VALUES ('quota_imported', ?)",
+                                    (datetime.now().isoformat(),))
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+            # From here on requests are waiting, better to turn one away than to stall it
+            self.db.execute(f"PRAGMA busy_timeout = {int(QUOTA_BUSY_TIMEOUT * 1000)}")
+
+    async def execute(self, sql, params=(), attempts=1):
+        """Run one statement in the executor; returns (rowcount, first row).
+        
+        Raises QuotaBusyError if another process held the write lock through every attempt.
+        """
+        def query():
+            with self.db_lock:
+                if self.purge_day is not None:
+                    self.db.execute("DELETE FROM quota_usage WHERE day < ?", (self.purge_day,))
+                    self.purge_day = None
+                cursor = self.db.execute(sql, params)
+                return cursor.rowcount, cursor.fetchone()
+        for attempt in range(attempts):
+            try:
+                return await asyncio.get_running_loop().run_in_executor(None, query)
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                if attempt + 1 < attempts:
+                    await asyncio.sleep(QUOTA_BUSY_TIMEOUT)
+        raise QuotaBusyError("shared quota database is locked")
+
+    def start_day(self):
+        # Past days can't match any query, so their rows are only purged lazily
+        self.purge_day = self.day
+
+    async def user_limit(self, user_id):
+        _, row = await self.execute("SELECT daily_limit FROM quota_limits WHERE user_id = ?", (user_id,))
+        return row[0] if row else None
+
+    async def used(self, user_id):
+        self.refresh_day()
+        _, row = await self.execute(
+            "SELECT count FROM quota_usage WHERE user_id = ? AND day = ?", (user_id, self.day)
+        )
+        return row[0] if row else 0
+
+    async def reserve(self, member, count=1):
+        self.refresh_day()
+        day = self.day
+        limit = await self.limit_for(member)
+        applied = 0
+        if count <= limit:
+            applied, _ = await self.execute(
+                "INSERT INTO quota_usage (user_id, day, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id, day) DO UPDATE SET count = count + excluded.count "
+                "WHERE count + excluded.count <= ?",
+                (member.id, day, count, limit),
+            )
+        _, row = await self.execute(
+            "SELECT count FROM quota_usage WHERE user_id = ? AND day = ?", (member.id, day)
+        )
+        return QuotaCheck(applied > 0, row[0] if row else 0, limit, day)
+
+    async def release(self, user_id, day, count=1):
+        # A lost refund costs the user quota, so this keeps trying for a while
+        try:
+            await self.execute(
+                "UPDATE quota_usage SET count = MAX(0, count - ?) WHERE user_id = ? AND day = ?",
+                (count, user_id, day), attempts=QUOTA_RELEASE_ATTEMPTS,
+            )
+        except QuotaBusyError:
+            quota_busy_total.inc(operation="release")
+            log.error("Could not refund reserved quota, database locked", user_id=user_id, count=count)
+
+    async def commit(self, user_id, day):
+        # Charged when it was reserved
+        pass
+
+    async def charge(self, user_id):
+        self.refresh_day()
+        await self.execute(
+            "INSERT INTO quota_usage (user_id, day, count) VALUES (?, ?, 1) "
+            "ON CONFLICT (user_id, day) DO UPDATE SET count = count + 1",
+            (user_id, self.day),
+        )
+
+    async def set_user_limit(self, user_id, limit):
+        def update():
+            with self.db_lock:
+                self.db.execute("BEGIN IMMEDIATE")
+                try:
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO quota_limits (user_id, daily_limit) VALUES (?, ?)", (user_id, limit)
+                    )
+                    # Moving the shared state version makes the other processes drop their cached limits
+                    self.db.execute(
+                        "INSERT INTO meta (key, value) VALUES ('state_version', '1') "
+                        "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+                    )
+                    self.db.execute("COMMIT")
+                except Exception:
+                    self.db.execute("ROLLBACK")
+                    raise
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, update)
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            raise QuotaBusyError("shared quota database is locked") from e
+        self.invalidate(user_id)
+
+quota = SharedQuotaService() if CLUSTERED else QuotaService()
+
+# ==== RENDERING ====
+# Everything that doesn't change per response is built once here: timezones, region
+# tables, description templates and the static embed parts.
+DISPLAY_TZ = pytz.timezone("Asia/Kathmandu")  # timestamps shown in embeds
+API_RESET_TZ = pytz.timezone(API_RESET_TIMEZONE)
+
+REGION_FLAGS = {
+    "BD": "🇧🇩", "IND": "🇮🇳", "ID": "🇮🇩", "TH": "🇹🇭", 
+    "VN": "🇻🇳", "SG": "🇸🇬", "MY": "🇲🇾", "PH": "🇵🇭",
+    "BR": "🇧🇷", "RU": "🇷🇺", "US": "🇺🇸", "PK": "🇵🇰",
+    "EG": "🇪🇬", "SA": "🇸🇦", "ME": "🇲🇪", "AUTO": "🌍"
+}
+VALID_REGIONS = frozenset(REGION_FLAGS)
+VALID_REGIONS_TEXT = ", ".join(REGION_FLAGS)
+
+FOOTER_TEXT = "DEVELOPER BY EM OFFICIAL TEAM"
+BANNER_URL = "https://cdn.discordapp.com/attachments/1389124738395148391/1414487474788503662/static_1.png?ex=68bfbf9d&is=68be6e1d&hm=c3b04478724a952c020d61707c987e18aa4690b1ae05a129ef5f35f0b6d72af5&"
+SIGNATURE = """🎮 [JOIN COMMUNITY](https://discord.gg/CmMG2xryMX)
+**DEVELOPER BY EM OFFICIAL TEAM** | {stamp}
+    """
+COLOR_SUCCESS = discord.Color.green()
+COLOR_WARNING = discord.Color.orange()
+COLOR_ERROR = discord.Color.red()
+
+SUCCESS_TEMPLATE = """
 ```
 ✅ LIKES SENT SUCCESSFULLY!
-┌─ PLAYER: {r['PlayerNickname']} ({r['UID']})
-├─ REGION: {region_flag} {r.get('Region', 'AUTO')}
-├─ LIKES ADDED: +{r['LikesGivenByAPI']}
-├─ BEFORE: {r['LikesbeforeCommand']} → AFTER: {r['LikesafterCommand']}
-└─ YOUR REMAINING LIMIT: {remaining_limit}
+┌─ PLAYER: {nickname} ({uid})
+├─ REGION: {flag} {region}
+├─ LIKES ADDED: +{likes}
+├─ BEFORE: {before} → AFTER: {after}
+└─ YOUR REMAINING LIMIT: {remaining}
 ```
-🎮 [JOIN COMMUNITY](https://discord.gg/CmMG2xryMX)
-**DEVELOPER BY EM OFFICIAL TEAM** | {date_str} {time_str}
-    """
-    
-    embed = discord.Embed(description=desc, color=discord.Color.green())
-    embed.set_thumbnail(url=user.display_avatar.url)
-    embed.set_image(url="https://cdn.discordapp.com/attachments/1389124738395148391/1414487474788503662/static_1.png?ex=68bfbf9d&is=68be6e1d&hm=c3b04478724a952c020d61707c987e18aa4690b1ae05a129ef5f35f0b6d72af5&")
-    return embed
+""" + SIGNATURE
 
-# ==== LIMIT REACHED EMBED ====
-def make_limit_embed(user, current_usage, daily_limit):
-    # Get current time in Nepal timezone
-    tz = pytz.timezone("Asia/Kathmandu")
-    current_time = datetime.now(tz)
-    date_str = current_time.strftime("%Y-%m-%d")
-    time_str = current_time.strftime("%H:%M:%S")
-    
-    desc = f"""
-**⚠️ Daily limit reached ({current_usage}/{daily_limit})**
+LIMIT_TEMPLATE = """
+**⚠️ Daily limit reached ({used}/{limit})**
 
 To get 5 requests/day:
 📺 [Subscribe](https://youtube.com/@emofficial1234?si=GgumInQC8DxjSHhK)
 📸 [Send Screenshot](https://discord.com/channels/1394679922068422738/1415038725775294657)
 
-🎮 [JOIN COMMUNITY](https://discord.gg/CmMG2xryMX)
-**DEVELOPER BY EM OFFICIAL TEAM** | {date_str} {time_str}
-    """
-    
-    embed = discord.Embed(description=desc, color=discord.Color.red())
-    embed.set_thumbnail(url=user.display_avatar.url)
-    return embed
+""" + SIGNATURE
 
-# ==== MAX LIKE EMBED ====
-def make_maxlike_embed(user):
-    # Get current time in Nepal timezone
-    tz = pytz.timezone("Asia/Kathmandu")
-    current_time = datetime.now(tz)
-    date_str = current_time.strftime("%Y-%m-%d")
-    time_str = current_time.strftime("%H:%M:%S")
-    
-    desc = f"""
+MAXLIKE_TEMPLATE = """
 ```
 API LIMIT REACHED!
 ┌─ STATUS: FAILED
@@ -306,18 +2117,265 @@ API LIMIT REACHED!
 ```
 💡 **Tip:** Use different UIDs or try again tomorrow
 
-🎮 [JOIN COMMUNITY](https://discord.gg/CmMG2xryMX)
-**DEVELOPER BY EM OFFICIAL TEAM** | {date_str} {time_str}
-    """
+""" + SIGNATURE
+
+BATCH_TEMPLATE = """
+```
+LIKES SENT: {success}/{total}
+{body}
+└─ YOUR REMAINING LIMIT: {remaining}
+```
+""" + SIGNATURE
+
+def get_region_flag(region):
+    """Get flag emoji for region"""
+    return REGION_FLAGS.get(region.upper(), "🌍")
+
+display_stamp_second = None
+display_stamp = ""
+
+def display_timestamp():
+    """Current "date time" in DISPLAY_TZ, formatted at most once per second"""
+    global display_stamp_second, display_stamp
+    second = int(time.time())
+    if second != display_stamp_second:
+        display_stamp = datetime.fromtimestamp(second, DISPLAY_TZ).strftime("%Y-%m-%d %H:%M:%S")
+        display_stamp_second = second
+    return display_stamp
+
+# ==== SUCCESS EMBED ====
+def make_success_embed(data, user, remaining_limit):
+    r = data["response"]
+    region = r.get("Region", "AUTO")
+    desc = SUCCESS_TEMPLATE.format(
+        nickname=r["PlayerNickname"], uid=r["UID"], flag=get_region_flag(region), region=region,
+        likes=r["LikesGivenByAPI"], before=r["LikesbeforeCommand"], after=r["LikesafterCommand"],
+        remaining=remaining_limit, stamp=display_timestamp(),
+    )
+    
+    embed = discord.Embed(description=desc, color=COLOR_SUCCESS)
+    embed.set_thumbnail(url=user.display_avatar.url)
+    embed.set_image(url=BANNER_URL)
+    return embed
+
+# ==== LIMIT REACHED EMBED ====
+def make_limit_embed(user, current_usage, daily_limit):
+    desc = LIMIT_TEMPLATE.format(used=current_usage, limit=daily_limit, stamp=display_timestamp())
+    embed = discord.Embed(description=desc, color=COLOR_ERROR)
+    embed.set_thumbnail(url=user.display_avatar.url)
+    return embed
+
+# ==== MAX LIKE EMBED ====
+def make_maxlike_embed(user):
+    embed = discord.Embed(description=MAXLIKE_TEMPLATE.format(stamp=display_timestamp()), color=COLOR_WARNING)
+    embed.set_thumbnail(url=user.display_avatar.url)
+    return embed
+
+# ==== BATCH RESULT EMBED ====
+def make_batch_embed(results, user, remaining_limit):
+    """One embed for a multi-UID !like, results is a list of (uid, data)"""
+    lines = []
+    success_count = 0
+    for uid, data in results:
+        status = data.get("status") if data else None
+        if status == "success":
+            success_count += 1
+            r = data["response"]
+            lines.append(f"✅ {r['PlayerNickname']} ({r['UID']}) {get_region_flag(r.get('Region', 'AUTO'))} "
+                         f"+{r['LikesGivenByAPI']} | {r['LikesbeforeCommand']} → {r['LikesafterCommand']}")
+        elif status == "maxlike":
+            lines.append(f"🚫 {uid} | UID has reached daily API limit")
+        else:
+            lines.append(f"❌ {uid} | API error, not charged")
+    
+    desc = BATCH_TEMPLATE.format(success=success_count, total=len(results), body="\n".join(lines),
+                                 remaining=remaining_limit, stamp=display_timestamp())
+    color = COLOR_SUCCESS if success_count == len(results) else (COLOR_WARNING if success_count else COLOR_ERROR)
+    embed = discord.Embed(description=desc, color=color)
+    embed.set_thumbnail(url=user.display_avatar.url)
+    return embed
+
+# ==== LIKE REQUEST SCHEDULER ====
+class LikeJob:
+    def __init__(self, uid, region, lane):
+        self.uid = uid
+        self.region = region
+        self.lane = lane
+        self.enqueued_at = time.monotonic()
+        self.future = asyncio.get_running_loop().create_future()
+
+class LikeScheduler:
+    """Queue for !like requests drained by a fixed pool of workers.
+    
+    Owners go to a priority lane; everyone else is queued per guild and the
+    guilds are served round-robin, so one busy guild can't take all the
+    upstream capacity.
+    """
+    def __init__(self, workers, high_water):
+        self.workers = workers
+        self.high_water = high_water
+        self.priority = deque()
+        self.lanes = OrderedDict()  # guild_id: deque of jobs, in round-robin order
+        self.size = 0
+        self.ready = None
+        self.tasks = []
+
+    def start(self):
+        if self.tasks:
+            return
+        self.ready = asyncio.Semaphore(self.size)
+        self.tasks = [asyncio.create_task(self.worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    def full(self):
+        return self.size >= self.high_water
+
+    def submit(self, uid, region, lane, priority=False):
+        """Queue a request; returns (job, position in queue)"""
+        self.start()
+        job = LikeJob(uid, region, lane)
+        if priority:
+            self.priority.append(job)
+            position = len(self.priority)
+        else:
+            queue = self.lanes.setdefault(lane, deque())
+            queue.append(job)
+            # Round-robin: each other guild gets at most as many turns before this job as its own queue holds
+            rank = len(queue)
+            position = len(self.priority) + sum(min(len(other), rank) for other in self.lanes.values())
+        self.size += 1
+        self.ready.release()
+        return job, position
+
+    def next_job(self):
+        if self.priority:
+            return self.priority.popleft()
+        lane, queue = next(iter(self.lanes.items()))
+        job = queue.popleft()
+        if queue:
+            self.lanes.move_to_end(lane)
+        else:
+            del self.lanes[lane]
+        return job
+
+    async def worker(self):
+        while True:
+            await self.ready.acquire()
+            job = self.next_job()
+            self.size -= 1
+            if job.future.done():
+                # The command was cancelled while it waited
+                continue
+            like_queue_wait_seconds.observe(time.monotonic() - job.enqueued_at)
+            try:
+                result = await fetch_like(job.uid, job.region)
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+                continue
+            if not job.future.done():
+                job.future.set_result(result)
+
+like_scheduler = LikeScheduler(LIKE_WORKERS, LIKE_QUEUE_HIGH_WATER)
+
+# ==== MESSAGE CLEANUP ====
+class MessageReaper:
+    """Deletes expiring bot messages from one timer task.
     
-    embed = discord.Embed(description=desc, color=discord.Color.orange())
-    embed.set_thumbnail(url=user.display_avatar.url)
-    return embed
+    Only (due time, channel, message id) is kept per message, in a min-heap.
+    Messages due together in one channel are removed with a single bulk delete
+    where the bot has Manage Messages, one by one otherwise.
+    """
+    def __init__(self):
+        self.heap = []  # (due_at, sequence, channel, message_id)
+        self.sequence = 0
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.no_bulk = set()  # channel ids where bulk delete was refused
+
+    def schedule(self, message, delay):
+        self.sequence += 1
+        heapq.heappush(self.heap, (time.monotonic() + delay, self.sequence, message.channel, message.id))
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+        self.wakeup.set()
+
+    async def stop(self):
+        """Stop the timer and delete everything still pending"""
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        await self.delete(self.pop(float("inf")))
+
+    def pop(self, now):
+        """Remove due entries from the heap, grouped as {channel id: (channel, [message ids])}"""
+        due = {}
+        while self.heap and self.heap[0][0] <= now:
+            _, _, channel, message_id = heapq.heappop(self.heap)
+            due.setdefault(channel.id, (channel, []))[1].append(message_id)
+        return due
+
+    async def run(self):
+        while True:
+            delay = self.heap[0][0] - time.monotonic() if self.heap else None
+            if delay is None or delay > 0:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self.delete(self.pop(time.monotonic()))
+            except Exception:
+                log.exception("💥 Message cleanup error")
+
+    async def delete(self, due):
+        await asyncio.gather(*(self.delete_in_channel(channel, ids) for channel, ids in due.values()))
+
+    async def delete_in_channel(self, channel, message_ids):
+        if len(message_ids) > 1 and channel.id not in self.no_bulk and hasattr(channel, "delete_messages"):
+            for start in range(0, len(message_ids), DELETE_BATCH_MAX):
+                chunk = message_ids[start:start + DELETE_BATCH_MAX]
+                try:
+                    await channel.delete_messages([discord.Object(id=message_id) for message_id in chunk])
+                except discord.Forbidden:
+                    # No Manage Messages here; the bot can still delete its own messages one at a time
+                    self.no_bulk.add(channel.id)
+                    message_ids = message_ids[start:]
+                    break
+                except discord.HTTPException as e:
+                    log.warning("Bulk message delete failed", channel_id=channel.id, messages=len(chunk), error=e)
+            else:
+                return
+        for message_id in message_ids:
+            try:
+                await channel.get_partial_message(message_id).delete()
+            except discord.NotFound:
+                pass
+            except discord.HTTPException as e:
+                log.warning("Message delete failed", channel_id=channel.id, message_id=message_id, error=e)
+
+message_reaper = MessageReaper()
 
 # ==== PREFIX LIKE COMMAND ====
+def observe_like(ctx, outcome):
+    """Record !like time from invocation to the user-visible reply"""
+    like_command_seconds.observe(time.monotonic() - ctx.like_started, outcome=outcome)
+
 @bot.command()
 @commands.cooldown(1, 30, commands.BucketType.user)
-async def like(ctx, region: str = "AUTO", uid: str = ""):
+async def like(ctx, region: str = "AUTO", *uids: str):
+    ctx.like_started = time.monotonic()
+    uids = list(dict.fromkeys(uids))  # drop repeats, keep order
+    uid = uids[0] if uids else ""
+    
     # Check if command is in allowed channel
     if ctx.guild and str(ctx.guild.id) in like_channels:
         allowed_channel_id = like_channels[str(ctx.guild.id)]
@@ -325,69 +2383,147 @@ async def like(ctx, region: str = "AUTO", uid: str = ""):
             channel = ctx.guild.get_channel(allowed_channel_id)
             if channel:
                 await ctx.send(f"❌ Use this command in {channel.mention} only.")
+                observe_like(ctx, "rejected")
                 return
     
     # Check if UID is provided
     if not uid:
-        await ctx.send("❌ Please provide UID. Usage: `!like [region] <uid>`")
+        await ctx.send("❌ Please provide UID. Usage: `!like [region] <uid> [uid ...]`")
+        observe_like(ctx, "rejected")
         return
     
-    # Validate UID
-    if not uid.isdigit() or len(uid) < 6:
-        await ctx.send("❌ Invalid UID. Must be only numbers & at least 6 digits.")
+    if len(uids) > LIKE_BATCH_MAX:
+        await ctx.send(f"❌ Too many UIDs. Max {LIKE_BATCH_MAX} per command.")
+        observe_like(ctx, "rejected")
         return
     
+    # Validate UIDs
+    for uid in uids:
+        if not uid.isdigit() or len(uid) < 6:
+            await ctx.send(f"❌ Invalid UID `{uid}`. Must be only numbers & at least 6 digits.")
+            observe_like(ctx, "rejected")
+            return
+    
     # Validate region
-    valid_regions = ["BD", "IND", "ID", "TH", "VN", "SG", "MY", "PH", "BR", "RU", "US", "PK", "EG", "SA", "ME", "AUTO"]
-    if region.upper() not in valid_regions:
-        await ctx.send(f"❌ Invalid region. Valid regions: {', '.join(valid_regions)}")
+    if region.upper() not in VALID_REGIONS:
+        await ctx.send(f"❌ Invalid region. Valid regions: {VALID_REGIONS_TEXT}")
+        observe_like(ctx, "rejected")
         return
     
-    # Check user's daily limit
-    daily_limit = get_user_daily_limit(ctx.author)
-    current_usage = get_user_usage_today(ctx.author.id)
+    # Turn requests away early while the queue is over its high-water mark
+    if like_scheduler.full():
+        like_queue_rejections_total.inc()
+        await ctx.send(f"🚦 The bot is busy right now ({like_scheduler.size} requests queued). "
+                       f"Please try again in {LIKE_QUEUE_RETRY_AFTER} seconds.")
+        observe_like(ctx, "busy")
+        return
     
-    if current_usage >= daily_limit:
-        msg = await ctx.send(embed=make_limit_embed(ctx.author, current_usage, daily_limit))
-        # Delete message after 20 seconds
-        await asyncio.sleep(20)
-        try:
-            await msg.delete()
-        except:
-            pass
+    # Check user's daily limit and reserve one request per UID from it
+    try:
+        check = await quota.reserve(ctx.author, len(uids))
+    except QuotaBusyError:
+        quota_busy_total.inc(operation="reserve")
+        await ctx.send("🚦 The bot is busy right now. Please try again in a few seconds.")
+        observe_like(ctx, "busy")
+        return
+    
+    if not check.allowed and check.used < check.limit:
+        await ctx.send(f"❌ You asked for {len(uids)} UIDs but only have **{check.limit - check.used}** "
+                       f"request(s) left today.")
+        quota_rejections_total.inc()
+        observe_like(ctx, "limit")
+        return
+    
+    if not check.allowed:
+        msg = await ctx.send(embed=make_limit_embed(ctx.author, check.used, check.limit))
+        quota_rejections_total.inc()
+        observe_like(ctx, "limit")
+        message_reaper.schedule(msg, LIMIT_MESSAGE_TTL)
         return
     
-    # Send processing message
-    processing_msg = await ctx.send("⏳ Processing your request...")
+    if len(uids) > 1:
+        await like_batch(ctx, region.upper(), uids, check)
+        return
     
+    # Queue the request and send processing message
+    charged = False
     try:
-        # Fetch likes from API
-        data = await fetch_like(uid, region.upper())
-        
-        if data is None:
-            await processing_msg.edit(content="❌ API connection failed. Please try again later.")
-            return
+        job, position = like_scheduler.submit(
+            uid, region.upper(), ctx.guild.id if ctx.guild else 0, priority=ctx.author.id in OWNER_IDS
+        )
+        processing_msg = await ctx.send(f"⏳ Processing your request... (position **{position}** in queue)")
         
-        if data.get("status") == "success":
-            # Increment user usage
-            increment_user_usage(ctx.author.id)
-            remaining_limit = daily_limit - (current_usage + 1)
+        try:
+            # Wait for a scheduler worker to fetch likes from API
+            data = await job.future
+            
+            if data is None:
+                await processing_msg.edit(content="❌ API connection failed. Please try again later.")
+                observe_like(ctx, "error")
+                return
+            
+            if data.get("status") == "success":
+                # Only likes that were actually sent count against the limit
+                await quota.commit(ctx.author.id, check.day)
+                charged = True
+                remaining_limit = check.limit - check.used
+                
+                # Send success embed
+                embed = make_success_embed(data, ctx.author, remaining_limit)
+                await processing_msg.edit(content="", embed=embed)
+                observe_like(ctx, "success")
+            
+            elif data.get("status") == "maxlike":
+                # UID has reached daily limit
+                embed = make_maxlike_embed(ctx.author)
+                await processing_msg.edit(content="", embed=embed)
+                observe_like(ctx, "maxlike")
             
-            # Send success embed
-            embed = make_success_embed(data, ctx.author, remaining_limit)
-            await processing_msg.edit(content="", embed=embed)
+            else:
+                await processing_msg.edit(content="❌ API returned an error. Please try again later.")
+                observe_like(ctx, "error")
         
-        elif data.get("status") == "maxlike":
-            # UID has reached daily limit
-            embed = make_maxlike_embed(ctx.author)
-            await processing_msg.edit(content="", embed=embed)
+        except Exception:
+            log.exception("Error in like command", uid=uid, region=region)
+            await processing_msg.edit(content="❌ An unexpected error occurred. Please try again later.")
+            observe_like(ctx, "error")
+    finally:
+        if not charged:
+            await quota.release(ctx.author.id, check.day)
+
+async def like_batch(ctx, region, uids, check):
+    """Fetch several UIDs concurrently and report them in one message; only successes are charged"""
+    charged = 0
+    try:
+        jobs = []
+        for uid in uids:
+            job, position = like_scheduler.submit(
+                uid, region, ctx.guild.id if ctx.guild else 0, priority=ctx.author.id in OWNER_IDS
+            )
+            jobs.append(job)
+        processing_msg = await ctx.send(f"⏳ Processing {len(uids)} UIDs... (position **{position}** in queue)")
         
-        else:
-            await processing_msg.edit(content="❌ API returned an error. Please try again later.")
-    
-    except Exception as e:
-        print(f"Error in like command: {e}")
-        await processing_msg.edit(content="❌ An unexpected error occurred. Please try again later.")
+        try:
+            # The scheduler's workers fetch them in parallel
+            results = await asyncio.gather(*(job.future for job in jobs), return_exceptions=True)
+            results = [(uid, None if isinstance(data, BaseException) else data) for uid, data in zip(uids, results)]
+            
+            for uid, data in results:
+                if data and data.get("status") == "success":
+                    await quota.commit(ctx.author.id, check.day)
+                    charged += 1
+            remaining_limit = check.limit - (check.used - len(uids) + charged)
+            
+            await processing_msg.edit(content="", embed=make_batch_embed(results, ctx.author, remaining_limit))
+            observe_like(ctx, "success" if charged else "error")
+        
+        except Exception:
+            log.exception("Error in batch like command", uids=len(uids), region=region)
+            await processing_msg.edit(content="❌ An unexpected error occurred. Please try again later.")
+            observe_like(ctx, "error")
+    finally:
+        if len(uids) > charged:
+            await quota.release(ctx.author.id, check.day, len(uids) - charged)
 
 # ==== SLASH COMMANDS FOR ADMIN ====
 @bot.tree.command(name="setlimit", description="Set daily limit for user or role (Owner only)")
@@ -395,16 +2531,23 @@ async def like(ctx, region: str = "AUTO", uid: str = ""):
     target="User or role to set limit for",
     limit="Daily limit number"
 )
-async def setlimit_slash(interaction: discord.Interaction, target: discord.Member | discord.Role, limit: int):
+async def setlimit_slash(interaction: discord.Interaction, target: discord.Member | discord.Role,
+                         limit: app_commands.Range[int, 0, 2**31 - 1]):
     if interaction.user.id not in OWNER_IDS:
         await interaction.response.send_message("❌ Only bot owners can use this command.", ephemeral=True)
         return
     
     if isinstance(target, discord.Member):
-        user_limits[str(target.id)] = limit
+        try:
+            await quota.set_user_limit(target.id, limit)
+        except QuotaBusyError:
+            quota_busy_total.inc(operation="set_user_limit")
+            await interaction.response.send_message("🚦 The database is busy, please try again.", ephemeral=True)
+            return
         await interaction.response.send_message(f"✅ Set daily limit for **{target.display_name}** to **{limit}** requests.")
     else:
         role_limits[str(target.id)] = limit
+        quota.set_role_limit(target.id, limit)
         await interaction.response.send_message(f"✅ Set daily limit for role **{target.name}** to **{limit}** requests.")
     
     save_data()
@@ -437,13 +2580,7 @@ async def setreport_slash(interaction: discord.Interaction, channel: discord.Tex
     await interaction.response.send_message(f"✅ Set auto-like report channel to {channel.mention}")
     save_data()
 
-@bot.tree.command(name="addauto", description="Add UID to auto-like system (Owner only)")
-@app_commands.describe(
-    uid="PUBG Mobile UID",
-    region="Region for the UID",
-    nickname="Nickname for the UID"
-)
-@app_commands.choices(region=[
+AUTO_LIKE_REGION_CHOICES = [
     app_commands.Choice(name="🇧🇩 Bangladesh", value="BD"),
     app_commands.Choice(name="🇮🇳 India", value="IND"),
     app_commands.Choice(name="🇮🇩 Indonesia", value="ID"),
@@ -460,22 +2597,43 @@ async def setreport_slash(interaction: discord.Interaction, channel: discord.Tex
     app_commands.Choice(name="🇸🇦 Saudi Arabia", value="SA"),
     app_commands.Choice(name="🇲🇪 Montenegro", value="ME"),
     app_commands.Choice(name="🌍 Auto Detect", value="AUTO")
-])
+]
+
+def validate_auto_entry(uid, region, nickname):
+    """Return an error message for an invalid auto-like entry, or None"""
+    if not uid.isdigit() or len(uid) < 6:
+        return "Invalid UID. Must be only numbers & at least 6 digits."
+    if region not in VALID_REGIONS:
+        return f"Invalid region `{region}`."
+    if not nickname:
+        return "Empty nickname."
+    return None
+
+@bot.tree.command(name="addauto", description="Add UID to auto-like system (Owner only)")
+@app_commands.describe(
+    uid="PUBG Mobile UID",
+    region="Region for the UID",
+    nickname="Nickname for the UID"
+)
+@app_commands.choices(region=AUTO_LIKE_REGION_CHOICES)
 async def addauto_slash(interaction: discord.Interaction, uid: str, region: str = "AUTO", nickname: str = "Unknown"):
     if interaction.user.id not in OWNER_IDS:
         await interaction.response.send_message("❌ Only bot owners can use this command.", ephemeral=True)
         return
     
-    # Validate UID
-    if not uid.isdigit() or len(uid) < 6:
-        await interaction.response.send_message("❌ Invalid UID. Must be only numbers & at least 6 digits.", ephemeral=True)
+    error = validate_auto_entry(uid, region.upper(), nickname)
+    if error:
+        await interaction.response.send_message(f"❌ {error}", ephemeral=True)
         return
     
+    auto_like_index.update(uid, auto_like_uids.get(uid), {"region": region.upper(), "nickname": nickname})
     auto_like_uids[uid] = {
         "region": region.upper(),
         "nickname": nickname
     }
     
+    auto_like_scheduler.schedule(uid)
+    
     await interaction.response.send_message(f"✅ Added **{nickname}** ({uid}) with region **{region.upper()}** to auto-like system.")
     save_data()
 
@@ -488,14 +2646,81 @@ async def removeauto_slash(interaction: discord.Interaction, uid: str):
     
     if uid in auto_like_uids:
         nickname = auto_like_uids[uid]["nickname"]
+        auto_like_index.update(uid, auto_like_uids[uid], None)
         del auto_like_uids[uid]
+        auto_like_scheduler.remove(uid)
         await interaction.response.send_message(f"✅ Removed **{nickname}** ({uid}) from auto-like system.")
         save_data()
     else:
         await interaction.response.send_message("❌ UID not found in auto-like system.", ephemeral=True)
 
+@addauto_slash.autocomplete("uid")
+async def known_uid_autocomplete(interaction: discord.Interaction, current: str):
+    # Autocomplete runs for anyone typing the command, not just owners
+    if interaction.user.id not in OWNER_IDS:
+        return []
+    choices = []
+    for uid in uid_index.complete(current.strip()):
+        entry = uid_index.table.get(uid, {})
+        choices.append(app_commands.Choice(
+            name=f"{uid} - {entry.get('nickname') or 'Unknown'} ({entry.get('region') or 'AUTO'})", value=uid
+        ))
+    return choices
+
+@removeauto_slash.autocomplete("uid")
+async def auto_uid_autocomplete(interaction: discord.Interaction, current: str):
+    if interaction.user.id not in OWNER_IDS:
+        return []
+    choices = []
+    for uid in auto_like_index.uids.prefix(current.strip(), 25):
+        data = auto_like_uids.get(uid)
+        if data:
+            choices.append(app_commands.Choice(name=f"{uid} - {data['nickname']} ({data['region']})", value=uid))
+    return choices
+
+class AutoListView(discord.ui.View):
+    """Prev/Next pages over a slice of the auto-like index; each page renders only its own rows"""
+    def __init__(self, region=None, nickname=""):
+        super().__init__(timeout=LISTAUTO_VIEW_TIMEOUT)
+        self.region = region
+        self.nickname = nickname
+        self.page = 0
+
+    def render(self):
+        entries, start, end = auto_like_index.name_range(self.region, self.nickname)
+        pages = max(1, -(-(end - start) // LISTAUTO_PAGE_SIZE))
+        # The index may have shrunk since the last click
+        self.page = max(0, min(self.page, pages - 1))
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= pages - 1
+        
+        filters = " ".join(part for part in (self.region, f'"{self.nickname}*"' if self.nickname else "") if part)
+        desc = f"**Auto-Like UIDs{' - ' + filters if filters else ''}:** {end - start}\n"
+        first = start + self.page * LISTAUTO_PAGE_SIZE
+        for _, uid in entries[first:min(end, first + LISTAUTO_PAGE_SIZE)]:
+            data = auto_like_uids.get(uid)
+            if data:
+                flag = get_region_flag(data["region"])
+                desc += f"{flag} **{data['nickname']}** - `{uid}` ({data['region']})\n"
+        
+        embed = discord.Embed(description=desc, color=discord.Color.blue())
+        embed.set_footer(text=f"Page {self.page + 1}/{pages}")
+        return embed
+
+    @discord.ui.button(label="◀ Prev", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        await interaction.response.edit_message(embed=self.render(), view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await interaction.response.edit_message(embed=self.render(), view=self)
+
 @bot.tree.command(name="listauto", description="List all UIDs in auto-like system (Owner only)")
-async def listauto_slash(interaction: discord.Interaction):
+@app_commands.describe(region="Only show this region", nickname="Only show nicknames starting with this")
+@app_commands.choices(region=AUTO_LIKE_REGION_CHOICES)
+async def listauto_slash(interaction: discord.Interaction, region: str = None, nickname: str = ""):
     if interaction.user.id not in OWNER_IDS:
         await interaction.response.send_message("❌ Only bot owners can use this command.", ephemeral=True)
         return
@@ -504,13 +2729,109 @@ async def listauto_slash(interaction: discord.Interaction):
         await interaction.response.send_message("📋 No UIDs in auto-like system.", ephemeral=True)
         return
     
-    desc = "**Auto-Like UIDs:**\n"
-    for uid, data in auto_like_uids.items():
-        flag = get_region_flag(data["region"])
-        desc += f"{flag} **{data['nickname']}** - `{uid}` ({data['region']})\n"
+    view = AutoListView(region, nickname.strip())
+    await interaction.response.send_message(embed=view.render(), view=view, ephemeral=True)
+
+def iter_import_rows(text):
+    """Yield (row number, uid, region, nickname) from a JSON or CSV auto-like export"""
+    if text.lstrip().startswith(("[", "{")):
+        entries = json.loads(text)
+        if isinstance(entries, dict):
+            # Same shape as auto_like_uids, which is what /exportauto writes
+            entries = [{"uid": uid, **(data if isinstance(data, dict) else {})} for uid, data in entries.items()]
+        for number, entry in enumerate(entries, 1):
+            if not isinstance(entry, dict):
+                yield number, "", "", ""
+                continue
+            yield (number, str(entry.get("uid", "")).strip(), str(entry.get("region", "AUTO")).strip().upper(),
+                   str(entry.get("nickname", "Unknown")).strip())
+        return
     
-    embed = discord.Embed(description=desc, color=discord.Color.blue())
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    for number, row in enumerate(csv.reader(io.StringIO(text)), 1):
+        if not row or not "".join(row).strip():
+            continue
+        if number == 1 and row[0].strip().lower() == "uid":
+            continue  # header
+        row = [cell.strip() for cell in row] + ["", ""]
+        yield number, row[0], (row[1] or "AUTO").upper(), row[2] or "Unknown"
+
+@bot.tree.command(name="importauto", description="Import auto-like UIDs from a CSV or JSON file (Owner only)")
+@app_commands.describe(file="CSV with uid,region,nickname columns, or a JSON export from /exportauto")
+async def importauto_slash(interaction: discord.Interaction, file: discord.Attachment):
+    if interaction.user.id not in OWNER_IDS:
+        await interaction.response.send_message("❌ Only bot owners can use this command.", ephemeral=True)
+        return
+    
+    if file.size > IMPORT_MAX_BYTES:
+        await interaction.response.send_message(f"❌ File too large (max {IMPORT_MAX_BYTES // 1024} KB).", ephemeral=True)
+        return
+    
+    await interaction.response.defer(ephemeral=True)
+    
+    # Rows are validated as they are parsed, only valid entries and the errors shown are kept;
+    # nothing is applied until the whole file has parsed
+    entries = {}
+    errors = []
+    error_count = 0
+    rows = 0
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+        for number, uid, region, nickname in iter_import_rows(text):
+            rows += 1
+            error = validate_auto_entry(uid, region, nickname)
+            if error:
+                error_count += 1
+                if len(errors) < IMPORT_MAX_ERRORS_SHOWN:
+                    errors.append(f"Row {number}: {error}")
+            else:
+                entries[uid] = {"region": region, "nickname": nickname}
+    except (UnicodeDecodeError, ValueError, csv.Error) as e:
+        await interaction.followup.send(f"❌ Could not parse file: {e}", ephemeral=True)
+        return
+    
+    added = sum(1 for uid in entries if uid not in auto_like_uids)
+    for uid, data in entries.items():
+        auto_like_index.update(uid, auto_like_uids.get(uid), data)
+        auto_like_uids[uid] = data
+        auto_like_scheduler.schedule(uid)
+    if entries:
+        save_data()
+        await flush_data()
+    log.info("📥 Auto-like UIDs imported", rows=rows, added=added,
+             updated=len(entries) - added, errors=error_count)
+    
+    desc = (f"**📥 Auto-Like Import**\n"
+            f"✅ Added: {added}\n"
+            f"♻️ Updated: {len(entries) - added}\n"
+            f"❌ Errors: {error_count}\n")
+    if errors:
+        desc += "\n" + "\n".join(errors)
+        if error_count > len(errors):
+            desc += f"\n… and {error_count - len(errors)} more"
+    embed = discord.Embed(description=desc[:4096], color=discord.Color.green() if not errors else discord.Color.orange())
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
+@bot.tree.command(name="exportauto", description="Export auto-like UIDs as a file (Owner only)")
+@app_commands.describe(format="File format")
+@app_commands.choices(format=[
+    app_commands.Choice(name="CSV", value="csv"),
+    app_commands.Choice(name="JSON", value="json")
+])
+async def exportauto_slash(interaction: discord.Interaction, format: str = "csv"):
+    if interaction.user.id not in OWNER_IDS:
+        await interaction.response.send_message("❌ Only bot owners can use this command.", ephemeral=True)
+        return
+    
+    buffer = io.StringIO()
+    if format == "json":
+        json.dump(dict(auto_like_uids.items()), buffer, indent=2, ensure_ascii=False)
+    else:
+        writer = csv.writer(buffer)
+        writer.writerow(["uid", "region", "nickname"])
+        writer.writerows((uid, data["region"], data["nickname"]) for uid, data in auto_like_uids.items())
+    
+    file = discord.File(io.BytesIO(buffer.getvalue().encode("utf-8")), filename=f"auto_like_uids.{format}")
+    await interaction.response.send_message(f"📤 {len(auto_like_uids)} auto-like UIDs.", file=file, ephemeral=True)
 
 @bot.tree.command(name="testapi", description="Test API connection (Owner only)")
 async def testapi_slash(interaction: discord.Interaction):
@@ -522,144 +2843,635 @@ async def testapi_slash(interaction: discord.Interaction):
     
     success = await test_api_connection()
     
+    breaker_line = f"\n⚡ Endpoints:\n{api_pool.describe()}"
     if success:
-        await interaction.edit_original_response(content="✅ API connection test successful!")
+        await interaction.edit_original_response(content="✅ API connection test successful!" + breaker_line)
     else:
-        await interaction.edit_original_response(content="❌ API connection test failed!")
+        await interaction.edit_original_response(content="❌ API connection test failed!" + breaker_line)
 
-# ==== AUTO-LIKE TASK ====
-@tasks.loop(hours=1)
-async def auto_like_task():
-    """Auto-like task that runs every hour"""
+@bot.tree.command(name="autohistory", description="Show auto-like totals for a past day (Owner only)")
+@app_commands.describe(date="Day to show, YYYY-MM-DD (default: today)")
+async def autohistory_slash(interaction: discord.Interaction, date: str = None):
+    if interaction.user.id not in OWNER_IDS:
+        await interaction.response.send_message("❌ Only bot owners can use this command.", ephemeral=True)
+        return
+    
+    if date is None:
+        date = get_today_date()
     try:
-        if auto_like_uids:
-            print(f"🤖 Starting auto-like for {len(auto_like_uids)} UIDs...")
-            
-            today = get_today_date()
-            if today not in auto_like_reports:
-                auto_like_reports[today] = []
-            
-            for uid, data in auto_like_uids.items():
-                try:
-                    result = await fetch_like(uid, data["region"])
-                    
-                    if result and result.get("status") == "success":
-                        likes_given = result["response"].get("LikesGivenByAPI", 0)
-                        print(f"✅ Auto-like success for {data['nickname']} ({uid}): +{likes_given} likes")
-                        
-                        auto_like_reports[today].append({
-                            "uid": uid,
-                            "nickname": data["nickname"],
-                            "region": data["region"],
-                            "status": "success",
-                            "likes": likes_given,
-                            "timestamp": datetime.now().strftime("%H:%M:%S")
-                        })
-                    else:
-                        print(f"❌ Auto-like failed for {data['nickname']} ({uid})")
-                        
-                        auto_like_reports[today].append({
-                            "uid": uid,
-                            "nickname": data["nickname"],
-                            "region": data["region"],
-                            "status": "failed",
-                            "likes": 0,
-                            "timestamp": datetime.now().strftime("%H:%M:%S")
-                        })
-                    
-                    # Wait 5 seconds between requests
-                    await asyncio.sleep(5)
-                    
-                except Exception as e:
-                    print(f"💥 Auto-like error for {uid}: {e}")
-            
-            # Send report to report channels
-            await send_auto_like_report()
-            save_data()
-        
-    except Exception as e:
-        print(f"💥 Auto-like task error: {e}")
+        datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        await interaction.response.send_message("❌ Invalid date. Use YYYY-MM-DD.", ephemeral=True)
+        return
+    
+    rollups = await get_daily_rollups(date)
+    if not rollups:
+        await interaction.response.send_message(f"📋 No auto-like history for {date}.", ephemeral=True)
+        return
+    
+    regions = {}  # region: [attempts, successes, likes]
+    for rollup in rollups:
+        totals = regions.setdefault(rollup["region"], [0, 0, 0])
+        totals[0] += rollup["attempts"]
+        totals[1] += rollup["successes"]
+        totals[2] += rollup["likes"]
+    
+    attempts = sum(totals[0] for totals in regions.values())
+    successes = sum(totals[1] for totals in regions.values())
+    likes = sum(totals[2] for totals in regions.values())
+    
+    desc = f"**📜 Auto-Like History - {date}**\n\n"
+    desc += f"🆔 UIDs: {len({rollup['uid'] for rollup in rollups})}\n"
+    desc += f"✅ Success: {successes}/{attempts}\n"
+    desc += f"💖 Total Likes Given: {likes}\n\n"
+    desc += "**🌍 By Region:**\n"
+    for region, (region_attempts, region_successes, region_likes) in sorted(regions.items(), key=lambda item: -item[1][2]):
+        desc += f"{get_region_flag(region)} {region}: {region_successes}/{region_attempts} | +{region_likes} likes\n"
+    
+    embed = discord.Embed(description=desc, color=discord.Color.blue())
+    await interaction.response.send_message(embed=embed, ephemeral=True)
 
-async def send_auto_like_report():
-    """Send auto-like report to all report channels"""
-    today = get_today_date()
+def format_seconds(value):
+    if value is None:
+        return "n/a"
+    if value == float("inf"):
+        return f">{Histogram.BUCKETS[-1]:g}s"
+    return f"≤{value:g}s"
+
+@bot.tree.command(name="stats", description="Show bot performance metrics (Owner only)")
+async def stats_slash(interaction: discord.Interaction):
+    if interaction.user.id not in OWNER_IDS:
+        await interaction.response.send_message("❌ Only bot owners can use this command.", ephemeral=True)
+        return
+    
+    outcomes = ("success", "maxlike", "cached", "error")
+    desc = "**📈 Bot Stats**\n\n"
+    desc += "**fetch_like:**\n"
+    desc += " | ".join(f"{outcome}: {fetch_like_seconds.count(outcome=outcome)}" for outcome in outcomes) + "\n"
+    desc += f"p50 {format_seconds(fetch_like_seconds.quantile(0.5))} | p99 {format_seconds(fetch_like_seconds.quantile(0.99))}\n"
+    desc += f"Upstream attempts: {api_attempts_total.total()} | timeouts: {api_attempts_total.total(outcome='timeout')}\n\n"
+    
+    desc += "**!like:**\n"
+    desc += f"Handled: {like_command_seconds.count()} | quota rejections: {quota_rejections_total.total()}\n"
+    desc += f"p50 {format_seconds(like_command_seconds.quantile(0.5))} | p99 {format_seconds(like_command_seconds.quantile(0.99))}\n\n"
+    
+    desc += "**Auto-like:**\n"
+    if last_sweep_stats:
+        desc += (f"Last sweep: {last_sweep_stats['uids']} UIDs in {last_sweep_stats['duration']:.1f}s "
+                 f"({last_sweep_stats['throughput']:.2f} UIDs/s)\n")
+    desc += f"Sweeps: {sweep_seconds.count()} | report p99 {format_seconds(report_seconds.quantile(0.99))}\n\n"
+    
+    desc += "**Storage:**\n"
+    desc += f"Flushes: {storage_flush_seconds.count()} | p50 {format_seconds(storage_flush_seconds.quantile(0.5))} | p99 {format_seconds(storage_flush_seconds.quantile(0.99))}\n\n"
+    
+    desc += "**Event loop:**\n"
+    desc += (f"Lag p50 {format_seconds(loop_lag_seconds.quantile(0.5))} | p99 {format_seconds(loop_lag_seconds.quantile(0.99))} "
+             f"| stalls: {loop_stalls_total.total()}\n\n")
+    
+    desc += "**Startup:**\n"
+    desc += " | ".join(f"{phase}: {seconds:.2f}s" for phase, seconds in startup_times.items()) + "\n"
+    
+    embed = discord.Embed(description=desc, color=discord.Color.blue())
+    if METRICS_PORT:
+        embed.set_footer(text=f"Full metrics: http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+profile_running = False
+
+def render_profile_report(profile, seconds):
+    """Hotspots by own time and by cumulative time, plus the latest loop stall stacks"""
+    out = io.StringIO()
+    out.write(f"Profile of {seconds}s, taken {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    for sort in ("tottime", "cumulative"):
+        out.write(f"\n==== Top {PROFILE_TOP} by {sort} ====\n")
+        pstats.Stats(profile, stream=out).strip_dirs().sort_stats(sort).print_stats(PROFILE_TOP)
+    if loop_watchdog.stalls:
+        out.write(f"\n==== Recent event loop stalls (> {LOOP_LAG_THRESHOLD}s) ====\n")
+        for at, blocked, stack in loop_watchdog.stalls:
+            out.write(f"\n-- {at}, blocked {blocked:.3f}s --\n{stack}")
+    return out.getvalue()
+
+@bot.tree.command(name="profile", description="Profile the running bot and upload a hotspot report (Owner only)")
+@app_commands.describe(seconds="How long to profile for")
+async def profile_slash(interaction: discord.Interaction, seconds: app_commands.Range[int, 1, PROFILE_MAX_SECONDS] = 10):
+    global profile_running
+    if interaction.user.id not in OWNER_IDS:
+        await interaction.response.send_message("❌ Only bot owners can use this command.", ephemeral=True)
+        return
+    
+    if profile_running:
+        await interaction.response.send_message("⏳ A profile is already running.", ephemeral=True)
+        return
+    
+    profile_running = True
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    try:
+        # cProfile follows the thread that enables it, which is the event loop thread
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profile.disable()
+        report = render_profile_report(profile, seconds)
+    finally:
+        profile_running = False
+    
+    file = discord.File(io.BytesIO(report.encode("utf-8")), filename=f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+    await interaction.followup.send(f"🔬 Profiled for {seconds}s.", file=file, ephemeral=True)
+
+# ==== RATE LIMITING ====
+class TokenBucket:
+    """Async token bucket: refills `rate` tokens per second up to `capacity`"""
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+global_bucket: TokenBucket | None = None
+region_buckets = {}  # region: TokenBucket
+
+def get_region_bucket(region):
+    """Get (or create) the rate limiter for a region"""
+    region = region.upper()
+    if region not in region_buckets:
+        rate, burst = AUTO_LIKE_REGION_RATES.get(region, (AUTO_LIKE_REGION_RATE, AUTO_LIKE_REGION_BURST))
+        region_buckets[region] = TokenBucket(rate, burst)
+    return region_buckets[region]
+
+async def acquire_rate_limit(region):
+    """Wait for a token from the region bucket and then the global bucket"""
+    global global_bucket
+    if global_bucket is None:
+        global_bucket = TokenBucket(AUTO_LIKE_GLOBAL_RATE, AUTO_LIKE_GLOBAL_BURST)
+    await get_region_bucket(region).acquire()
+    await global_bucket.acquire()
+
+# ==== AUTO-LIKE TASK ====
+last_sweep_stats = {}  # stats of the most recent auto-like batch
+
+async def run_auto_like_sweep(targets):
+    """Run fetch_like for every (uid, data) pair with bounded parallelism"""
+    queue = asyncio.Queue()
+    for item in targets:
+        queue.put_nowait(item)
+    
+    results = []
+    
+    async def worker():
+        while True:
+            try:
+                uid, data = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                region = uid_index.resolve_region(uid, data["region"])
+                # Batches overlap, the slots keep their combined parallelism at AUTO_LIKE_CONCURRENCY
+                async with auto_like_slots:
+                    await acquire_rate_limit(region)
+                    result = await fetch_like(uid, region)
+            except Exception:
+                log.exception("💥 Auto-like error", uid=uid)
+                result = None
+            results.append((uid, data, result))
+    
+    workers = min(AUTO_LIKE_CONCURRENCY, len(targets))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return results
+
+class AutoLikeScheduler:
+    """Min-heap of per-UID due times.
     
-    if today not in auto_like_reports or not auto_like_reports[today]:
+    Removing a UID only forgets its due time; its heap entry is skipped as
+    stale when it reaches the top, so removal is O(1).
+    """
+    def __init__(self):
+        self.heap = []  # (due_at, sequence, uid)
+        self.due = {}   # uid: due_at of its live heap entry
+        self.failures = {}  # uid: consecutive failed attempts
+        self.running = set()  # popped and not recorded yet
+        self.sequence = 0
+        self.wakeup = asyncio.Event()
+
+    def schedule(self, uid, due_at=None):
+        if not owns_uid(uid):
+            return  # another cluster process sweeps it
+        if due_at is None:
+            due_at = time.time()
+        self.due[uid] = due_at
+        self.sequence += 1
+        heapq.heappush(self.heap, (due_at, self.sequence, uid))
+        if len(self.heap) > 2 * len(self.due) + 64:
+            # Too many stale entries, rebuild from the live due times
+            self.heap = [(due, index, uid) for index, (uid, due) in enumerate(self.due.items())]
+            heapq.heapify(self.heap)
+        self.wakeup.set()
+
+    def remove(self, uid):
+        self.due.pop(uid, None)
+        self.failures.pop(uid, None)
+
+    def sync(self, uids):
+        """Match the schedule to the current UID set: new UIDs are due now, removed ones are dropped"""
+        for uid in list(self.due):
+            if uid not in uids:
+                self.remove(uid)
+        for uid in uids:
+            if uid not in self.due and uid not in self.running:
+                self.schedule(uid)
+
+    def load(self, uids, done_today=()):
+        """Schedule every UID: due now, or at the next reset if it already got likes today"""
+        self.heap = []
+        self.due = {}
+        reset = next_api_reset()
+        for uid in uids:
+            self.schedule(uid, self.after_reset(reset) if uid in done_today else None)
+
+    @staticmethod
+    def after_reset(reset):
+        return reset + random.uniform(0, AUTO_LIKE_RESET_SPREAD)
+
+    def drop_stale(self):
+        while self.heap and self.due.get(self.heap[0][2]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def next_due(self):
+        self.drop_stale()
+        return self.heap[0][0] if self.heap else None
+
+    async def wait_due(self):
+        """Sleep until at least one UID is due; new schedules wake it early"""
+        while True:
+            due_at = self.next_due()
+            delay = None if due_at is None else due_at - time.time()
+            if delay is not None and delay <= 0:
+                return
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def pop_due(self):
+        now = time.time()
+        uids = []
+        while self.next_due() is not None and self.heap[0][0] <= now:
+            _, _, uid = heapq.heappop(self.heap)
+            del self.due[uid]
+            self.running.add(uid)
+            uids.append(uid)
+        return uids
+
+    def record(self, uid, status):
+        """Schedule the next attempt: after the daily reset once likes landed or the UID is maxed out,
+        with exponential backoff after errors"""
+        self.running.discard(uid)
+        if uid not in auto_like_uids or uid in self.due:
+            return
+        if status in ("success", "maxlike"):
+            self.failures.pop(uid, None)
+            self.schedule(uid, self.after_reset(next_api_reset()))
+        else:
+            failures = self.failures.get(uid, 0) + 1
+            self.failures[uid] = failures
+            delay = min(AUTO_LIKE_RETRY_MAX, AUTO_LIKE_RETRY_BASE * 2 ** (failures - 1))
+            self.schedule(uid, time.time() + random.uniform(0.5, 1.0) * delay)
+
+    def describe(self):
+        due_at = self.next_due()
+        if due_at is None:
+            return "nothing scheduled"
+        return f"{len(self.due)} UIDs scheduled, next in {max(0, due_at - time.time()):.0f}s"
+
+auto_like_scheduler = AutoLikeScheduler()
+auto_like_slots = asyncio.Semaphore(AUTO_LIKE_CONCURRENCY)
+auto_like_batches = set()  # running run_auto_like_batch tasks
+last_report_at = 0.0
+report_pending = False  # results were recorded since the last report
+
+async def init_auto_like_schedule():
+    """Seed the scheduler; UIDs that already got likes (or were maxed out) since the last reset wait for the next one"""
+    # Report dates are server-local, the reset isn't: it falls on today's or yesterday's date
+    since = last_api_reset()
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    reports = await storage.get_reports(yesterday) + await storage.get_reports(get_today_date())
+    done_today = {
+        report["uid"] for report in reports
+        if report["status"] in ("success", "maxlike") and (report.get("at") or 0) >= since
+    }
+    auto_like_scheduler.load(list(auto_like_uids), done_today)
+    log.info("🗓️ Auto-like schedule loaded", uids=len(auto_like_uids), done_today=len(done_today))
+
+async def run_auto_like_batch(uids):
+    """Like every due UID with the sweep engine, record results and reschedule each UID"""
+    global report_pending
+    # UIDs removed since they were scheduled are simply dropped
+    targets = [(uid, auto_like_uids[uid]) for uid in uids if uid in auto_like_uids]
+    for uid in uids:
+        if uid not in auto_like_uids:
+            auto_like_scheduler.running.discard(uid)
+    if not targets:
         return
+    log.info("🤖 Starting auto-like batch", uids=len(targets), concurrency=AUTO_LIKE_CONCURRENCY)
     
-    # Create report embed
-    tz = pytz.timezone("Asia/Kathmandu")
-    current_time = datetime.now(tz)
-    time_str = current_time.strftime("%H:%M:%S")
+    today = get_today_date()
     
-    desc = f"**🤖 Auto-Like Report - {today} {time_str}**\n\n"
+    started = time.monotonic()
+    results = await run_auto_like_sweep(targets)
+    duration = time.monotonic() - started
+    sweep_seconds.observe(duration)
     
     success_count = 0
-    total_likes = 0
+    for uid, data, result in results:
+        status = result["status"] if result else "failed"
+        sweep_uids_total.inc(status=status)
+        auto_like_scheduler.record(uid, status)
+        likes_given = 0
+        if status == "success":
+            success_count += 1
+            likes_given = result["response"].get("LikesGivenByAPI", 0)
+            log.info("✅ Auto-like success", uid=uid, nickname=data["nickname"], likes=likes_given)
+        else:
+            log.info("❌ Auto-like failed", uid=uid, nickname=data["nickname"], status=status)
+        
+        storage.add_report(today, {
+            "uid": uid,
+            "nickname": data["nickname"],
+            "region": data["region"],
+            "status": status,
+            "likes": likes_given,
+            "timestamp": datetime.now().strftime("%H:%M:%S"),
+            "at": time.time(),
+        })
     
-    for report in auto_like_reports[today]:
-        status_emoji = "✅" if report["status"] == "success" else "❌"
+    last_sweep_stats.update({
+        "uids": len(results),
+        "success": success_count,
+        "duration": duration,
+        "throughput": len(results) / duration if duration > 0 else 0.0,
+    })
+    log.info("🏁 Auto-like batch finished", uids=len(results), success=success_count,
+             duration=round(duration, 1), throughput=round(last_sweep_stats["throughput"], 2),
+             schedule=auto_like_scheduler.describe())
+    save_data()
+    report_pending = True
+    await send_pending_auto_like_report()
+
+async def send_pending_auto_like_report():
+    """Report new results, at most once per interval since error retries make small batches all day long"""
+    global last_report_at, report_pending
+    if not report_pending or time.monotonic() - last_report_at < AUTO_LIKE_REPORT_INTERVAL:
+        return
+    last_report_at = time.monotonic()
+    report_pending = False
+    await send_auto_like_report()
+    await apply_report_retention()
+
+def auto_like_batch_done(task):
+    auto_like_batches.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        log.error("💥 Auto-like batch error", exc_info=task.exception())
+
+@tasks.loop(seconds=0)
+async def auto_like_task():
+    """Wait until auto-likes are due, then start a batch for them"""
+    try:
+        await auto_like_scheduler.wait_due()
+        # Not awaited: a UID that hangs for the whole retry budget mustn't hold up the ones due after it
+        batch = asyncio.create_task(run_auto_like_batch(auto_like_scheduler.pop_due()))
+        auto_like_batches.add(batch)
+        batch.add_done_callback(auto_like_batch_done)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        log.exception("💥 Auto-like task error")
+        # Don't spin on a persistent error
+        await asyncio.sleep(5)
+
+@tasks.loop(seconds=AUTO_LIKE_REPORT_CHECK)
+async def auto_like_report_task():
+    """Trailing edge of the report interval: results after the last report go out even when no batch runs"""
+    try:
+        await send_pending_auto_like_report()
+    except Exception:
+        log.exception("💥 Auto-like report error")
+
+@auto_like_report_task.before_loop
+async def before_auto_like_report_task():
+    await bot.wait_until_ready()
+
+@auto_like_task.before_loop
+async def before_auto_like_task():
+    # Reports need the guild cache
+    await bot.wait_until_ready()
+
+async def apply_report_retention():
+    """Compact raw auto-like reports that fell out of the retention window into daily rollups"""
+    now = datetime.now()
+    cutoff = (now - timedelta(days=REPORT_RETENTION_DAYS)).strftime("%Y-%m-%d")
+    rollup_cutoff = (now - timedelta(days=ROLLUP_RETENTION_DAYS)).strftime("%Y-%m-%d")
+    compacted = await storage.compact_reports(cutoff, rollup_cutoff)
+    if compacted:
+        log.info("🗜️ Compacted auto-like reports into daily rollups", rows=compacted, before=cutoff)
+
+async def get_daily_rollups(date):
+    """Per-UID/region totals for a day: from raw rows inside the retention window, else from rollups"""
+    reports = await storage.get_reports(date)
+    if reports:
+        return rollup_reports(reports)
+    return await storage.get_rollups(date)
+
+async def send_auto_like_report():
+    """Send auto-like report to all report channels"""
+    started = time.monotonic()
+    try:
+        await deliver_auto_like_report()
+    finally:
+        report_seconds.observe(time.monotonic() - started)
+
+def render_report_rows(reports):
+    """Yield each report row rendered as a markdown entry string"""
+    for report in reports:
+        status_emoji = {"success": "✅", "maxlike": "🚫"}.get(report["status"], "❌")
         flag = get_region_flag(report["region"])
-        
-        desc += f"{status_emoji} {flag} **{report['nickname']}** - `{report['uid']}`\n"
-        desc += f"   └─ Likes: +{report['likes']} | Time: {report['timestamp']}\n\n"
-        
-        if report["status"] == "success":
-            success_count += 1
-            total_likes += report["likes"]
+        yield (f"{status_emoji} {flag} **{report['nickname']}** - `{report['uid']}`\n"
+               f"   └─ Likes: +{report['likes']} | Time: {report['timestamp']}\n\n")
+
+def render_report_summary(reports):
+    success = [report for report in reports if report["status"] == "success"]
+    total_likes = sum(report["likes"] for report in success)
+    summary = (f"**📊 Summary:**\n"
+               f"✅ Success: {len(success)}/{len(reports)}\n"
+               f"💖 Total Likes Given: {total_likes}\n")
+    if last_sweep_stats:
+        summary += (f"⏱️ Last Batch: {last_sweep_stats['uids']} UIDs in {last_sweep_stats['duration']:.1f}s "
+                    f"({last_sweep_stats['throughput']:.2f} UIDs/s)\n")
+    summary += f"🗓️ Schedule: {auto_like_scheduler.describe()}\n"
+    return summary
+
+def paginate(chunks, limit):
+    """Pack text chunks into pages of at most limit characters, never splitting a chunk"""
+    pages = []
+    page = []
+    size = 0
+    for chunk in chunks:
+        if page and size + len(chunk) > limit:
+            pages.append("".join(page))
+            page = []
+            size = 0
+        page.append(chunk[:limit])
+        size += len(page[-1])
+    if page:
+        pages.append("".join(page))
+    return pages
+
+def render_auto_like_report(today, reports):
+    """Render the report as embed pages, plus the full text as a file when there are too many pages.
     
-    desc += f"**📊 Summary:**\n"
-    desc += f"✅ Success: {success_count}/{len(auto_like_reports[today])}\n"
-    desc += f"💖 Total Likes Given: {total_likes}\n"
+    Returns (embeds, attachment), attachment is (filename, bytes) or None.
+    """
+    time_str = datetime.now(DISPLAY_TZ).strftime("%H:%M:%S")
+    title = f"**🤖 Auto-Like Report - {today} {time_str}**"
+    summary = render_report_summary(reports)
+    rows = list(render_report_rows(reports))
     
-    embed = discord.Embed(description=desc, color=discord.Color.blue())
-    embed.set_footer(text="DEVELOPER BY EM OFFICIAL TEAM")
+    pages = paginate(rows + [summary], REPORT_PAGE_CHARS - len(title) - 32)
+    attachment = None
+    if len(pages) > REPORT_MAX_PAGES:
+        text = f"Auto-Like Report - {today} {time_str}\n\n" + "".join(rows).replace("**", "").replace("`", "")
+        attachment = (f"auto_like_report_{today}.txt", text.encode("utf-8"))
+        pages = [f"📎 {len(rows)} entries, full list attached.\n\n{summary}"]
     
-    # Send to all report channels
-    for guild_id, channel_id in report_channels.items():
-        try:
-            guild = bot.get_guild(int(guild_id))
-            if guild:
-                channel = guild.get_channel(channel_id)
-                if channel:
+    embeds = []
+    for index, page in enumerate(pages, 1):
+        header = title if len(pages) == 1 else f"{title} ({index}/{len(pages)})"
+        embed = discord.Embed(description=f"{header}\n\n{page}", color=discord.Color.blue())
+        embed.set_footer(text=FOOTER_TEXT)
+        embeds.append(embed)
+    return embeds, attachment
+
+async def send_report_to_channel(guild_id, channel_id, embeds, attachment):
+    guild = bot.get_guild(int(guild_id))
+    channel = guild.get_channel(channel_id) if guild else None
+    if channel is None:
+        report_deliveries_total.inc(status="missing")
+        return
+    try:
+        async def send_pages():
+            # The messages to one channel stay in order; discord.py paces them with the route's rate limit
+            for index, embed in enumerate(embeds):
+                if attachment and index == len(embeds) - 1:
+                    filename, content = attachment
+                    await channel.send(embed=embed, file=discord.File(io.BytesIO(content), filename=filename))
+                else:
                     await channel.send(embed=embed)
-        except Exception as e:
-            print(f"Error sending report to {guild_id}/{channel_id}: {e}")
+        await asyncio.wait_for(send_pages(), timeout=REPORT_SEND_TIMEOUT)
+        report_deliveries_total.inc(status="sent")
+    except asyncio.TimeoutError:
+        report_deliveries_total.inc(status="timeout")
+        log.warning("Timed out sending report", guild_id=guild_id, channel_id=channel_id)
+    except Exception as e:
+        report_deliveries_total.inc(status="error")
+        log.warning("Error sending report", guild_id=guild_id, channel_id=channel_id, error=e)
 
-# ==== BOT EVENTS ====
-@bot.event
-async def on_ready():
-    print(f"✅ {bot.user} is online!")
-    print(f"📊 Connected to {len(bot.guilds)} servers")
-    print(f"🔗 API Endpoint: {API_BASE}")
+async def deliver_auto_like_report():
+    """Render today's report once and send it to every report channel concurrently"""
+    today = get_today_date()
+    reports = await storage.get_reports(today)
+    
+    if not reports:
+        return
+    
+    embeds, attachment = render_auto_like_report(today, reports)
     
-    # Load data
-    load_data()
+    # A slow or broken guild only holds up its own slot
+    semaphore = asyncio.Semaphore(REPORT_SEND_CONCURRENCY)
     
-    # Test API connection
-    await test_api_connection()
+    async def deliver(guild_id, channel_id):
+        async with semaphore:
+            await send_report_to_channel(guild_id, channel_id, embeds, attachment)
     
-    # Start auto-like task
-    if not auto_like_task.is_running():
-        auto_like_task.start()
-        print("🤖 Auto-like task started!")
+    # In a cluster every process delivers to the guilds on its own shards
+    await asyncio.gather(*(
+        deliver(guild_id, channel_id) for guild_id, channel_id in list(report_channels.items())
+        if is_local_guild(guild_id)
+    ))
+
+# ==== BOT EVENTS ====
+startup_times = {}  # phase: seconds since process start
+
+def mark_startup(phase):
+    """Record the first time a startup phase is reached"""
+    if phase in startup_times:
+        return
+    elapsed = time.monotonic() - process_started
+    startup_times[phase] = elapsed
+    startup_seconds.observe(elapsed, phase=phase)
+    log.info("⏱️ Startup phase reached", phase=phase, seconds=round(elapsed, 3))
+
+@bot.event
+async def on_ready():
+    # Fires again after every gateway reconnect, so it must stay cheap and idempotent
+    log.info("✅ Bot is online", user=bot.user, guilds=len(bot.guilds))
+    log.info("🔗 API endpoints", endpoints=", ".join(API_ENDPOINTS))
+    mark_startup("ready")
+
+@bot.event
+async def on_command_completion(ctx):
+    mark_startup("first_command")
+
+@bot.event
+async def on_app_command_completion(interaction, command):
+    mark_startup("first_command")
+
+@bot.event
+async def on_member_update(before, after):
+    # Role changes can change the member's effective daily limit
+    if before.roles != after.roles:
+        quota.invalidate(after.id, after.guild.id)
 
 @bot.event
 async def on_command_error(ctx, error):
     if isinstance(error, commands.CommandOnCooldown):
         await ctx.send(f"⏱️ Command on cooldown. Try again in {error.retry_after:.1f} seconds.")
     elif isinstance(error, commands.MissingRequiredArgument):
-        await ctx.send("❌ Missing required argument. Usage: `!like [region] <uid>`")
+        await ctx.send("❌ Missing required argument. Usage: `!like [region] <uid> [uid ...]`")
     else:
-        print(f"Command error: {error}")
+        log.error("Command error", command=ctx.command, error=error)
 
 # ==== RUN BOT ====
 if __name__ == "__main__":
     if not BOT_TOKEN:
-        print("❌ BOT_TOKEN environment variable not set!")
-        print("Please add your Discord bot token to environment variables.")
+        log.error("❌ BOT_TOKEN environment variable not set! Please add your Discord bot token to environment variables.")
+    elif CLUSTERED and (not SHARD_COUNT or not 0 <= CLUSTER_ID < CLUSTER_COUNT or CLUSTER_COUNT > SHARD_COUNT):
+        log.error("❌ Clusters need SHARD_COUNT >= CLUSTER_COUNT and 0 <= CLUSTER_ID < CLUSTER_COUNT.")
     else:
+        log.info("🧩 Starting", cluster=f"{CLUSTER_ID + 1}/{CLUSTER_COUNT}",
+                 shards=SHARD_IDS if SHARD_IDS is not None else "all")
         try:
-            bot.run(BOT_TOKEN)
-        except Exception as e:
-            print(f"❌ Failed to start bot: {e}")
+            # log_handler=None keeps discord.py logging on our queue handler
+            bot.run(BOT_TOKEN, log_handler=None)
+        except Exception:
+            log.exception("❌ Failed to start bot")
+        finally:
+            # Catch anything close() did not get to flush
+            if storage is not None:
+                storage.close()
+            if not CLUSTERED:
+                usage_store.flush_sync()
+            log_listener.stop()
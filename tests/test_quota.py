@@ -0,0 +1,103 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import main
+from main import QuotaService, UsageStore
+
+
+@pytest.fixture
+def quota(tmp_path):
+    service = QuotaService()
+    service.load(UsageStore(str(tmp_path / "usage.bin")), {})
+    return service
+
+
+def member(user_id=1, roles=(), guild_id=None):
+    guild = SimpleNamespace(id=guild_id) if guild_id is not None else None
+    return SimpleNamespace(id=user_id, roles=[SimpleNamespace(id=role_id) for role_id in roles], guild=guild)
+
+
+def next_day(monkeypatch, quota):
+    """Move the service past midnight without waiting for it"""
+    tomorrow = datetime.now() + timedelta(days=1)
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return tomorrow
+
+    monkeypatch.setattr(main, "datetime", FrozenDatetime)
+    quota.next_rollover = 0.0
+
+
+def test_reserve_is_all_or_nothing(quota):
+    async def run():
+        await quota.set_user_limit(1, 3)
+        check = await quota.reserve(member(), 2)
+        assert check.allowed and check.used == 2 and check.limit == 3
+        # Only one unit left: a batch of two reserves nothing
+        check = await quota.reserve(member(), 2)
+        assert not check.allowed and check.used == 2
+        assert quota.reserved[1] == 2
+    asyncio.run(run())
+
+
+def test_commit_charges_and_release_refunds(quota):
+    async def run():
+        check = await quota.reserve(member(), 2)
+        await quota.commit(1, check.day)
+        await quota.release(1, check.day)
+        assert await quota.used(1) == 1
+        assert 1 not in quota.reserved
+        assert quota.store.dirty
+        check = await quota.reserve(member(), main.DEFAULT_DAILY_LIMIT)
+        assert not check.allowed and check.used == 1
+    asyncio.run(run())
+
+
+def test_role_limit_applies_without_individual_limit(quota):
+    async def run():
+        quota.set_role_limit(7, 5)
+        assert await quota.limit_for(member(roles=[7])) == 5
+        await quota.set_user_limit(1, 1)
+        assert await quota.limit_for(member(roles=[7])) == 1
+    asyncio.run(run())
+
+
+def test_day_rollover_resets_usage_and_reservations(quota, monkeypatch):
+    async def run():
+        await quota.set_user_limit(1, 2)
+        charged = await quota.reserve(member(), 1)
+        await quota.commit(1, charged.day)
+        pending = await quota.reserve(member(), 1)
+        assert pending.allowed and await quota.used(1) == 1
+
+        next_day(monkeypatch, quota)
+        assert await quota.used(1) == 0
+        assert quota.day == pending.day + 1
+        assert quota.reserved == {}
+
+        # Settling yesterday's reservation must not touch the new day
+        await quota.commit(1, pending.day)
+        await quota.release(1, pending.day)
+        assert await quota.used(1) == 0
+        check = await quota.reserve(member(), 2)
+        assert check.allowed and check.day == quota.day
+        # Individual limits survive the rollover
+        assert check.limit == 2
+    asyncio.run(run())
+
+
+def test_role_limit_is_cached_per_guild(quota):
+    async def run():
+        quota.set_role_limit(7, 10)
+        assert await quota.limit_for(member(roles=[7], guild_id=100)) == 10
+        # Same user in a guild where they don't hold the role
+        assert await quota.limit_for(member(guild_id=200)) == main.DEFAULT_DAILY_LIMIT
+        assert await quota.limit_for(member()) == main.DEFAULT_DAILY_LIMIT
+        quota.invalidate(1, 100)
+        assert await quota.limit_for(member(guild_id=100)) == main.DEFAULT_DAILY_LIMIT
+    asyncio.run(run())
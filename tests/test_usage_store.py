@@ -0,0 +1,86 @@
+import random
+from array import array
+
+import pytest
+
+from main import CompactIntMap, UsageStore
+
+
+def test_compact_int_map_matches_dict():
+    rng = random.Random(1)
+    compact = CompactIntMap()
+    expected = {}
+    # Enough keys to go through several merges, with overwrites of merged and pending keys
+    for _ in range(CompactIntMap.MIN_MERGE * 3):
+        key = rng.randrange(CompactIntMap.MIN_MERGE * 2)
+        value = rng.randrange(1000)
+        compact[key] = value
+        expected[key] = value
+    assert len(compact) == len(expected)
+    for key in range(CompactIntMap.MIN_MERGE * 2):
+        assert compact.get(key) == expected.get(key)
+    assert list(compact.items()) == sorted(expected.items())
+    assert not compact.pending
+
+
+def test_compact_int_map_merge_keeps_keys_sorted():
+    compact = CompactIntMap.from_arrays(array("Q", [10, 20, 30]), array("I", [1, 2, 3]))
+    for key in (5, 25, 40):
+        compact[key] = key
+    compact[20] = 7
+    compact.merge()
+    assert list(compact.keys) == [5, 10, 20, 25, 30, 40]
+    assert list(compact.values) == [5, 1, 7, 25, 3, 40]
+
+
+def test_usage_store_round_trip(tmp_path):
+    path = str(tmp_path / "usage.bin")
+    store = UsageStore(path)
+    store.start_day(739000)
+    for user_id in range(100):
+        store.usage[10 ** 17 + user_id] = user_id % 7
+    store.limits[42] = -1
+    store.limits[2 ** 63] = 50
+    store.flush_sync()
+    assert not store.dirty
+
+    loaded = UsageStore(path)
+    assert loaded.load()
+    assert loaded.day == 739000
+    assert list(loaded.usage.items()) == list(store.usage.items())
+    assert list(loaded.limits.items()) == [(42, -1), (2 ** 63, 50)]
+    assert not loaded.dirty
+
+
+def test_usage_store_missing_file(tmp_path):
+    assert not UsageStore(str(tmp_path / "usage.bin")).load()
+
+
+def test_usage_store_rejects_wrong_magic(tmp_path):
+    path = tmp_path / "usage.bin"
+    path.write_bytes(UsageStore.HEADER.pack(b"XXXX", 1, 0, 0))
+    with pytest.raises(ValueError, match="not a usage store"):
+        UsageStore(str(path)).load()
+
+
+@pytest.mark.parametrize("keep", [0, UsageStore.HEADER.size - 1, UsageStore.HEADER.size + 12])
+def test_usage_store_rejects_truncated_file(tmp_path, keep):
+    path = str(tmp_path / "usage.bin")
+    store = UsageStore(path)
+    store.start_day(739000)
+    for user_id in range(10):
+        store.usage[user_id] = 1
+    store.flush_sync()
+    with open(path, "r+b") as f:
+        f.truncate(keep)
+    with pytest.raises(ValueError, match="truncated"):
+        UsageStore(path).load()
+
+
+def test_usage_store_failed_flush_stays_dirty(tmp_path):
+    store = UsageStore(str(tmp_path / "usage.bin"))
+    store.limits[1] = 2 ** 40  # doesn't fit the signed 32-bit limit array
+    store.dirty = True
+    store.flush_sync()
+    assert store.dirty
+    assert not (tmp_path / "usage.bin").exists()